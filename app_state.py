@@ -0,0 +1,37 @@
+import os
+import json
+
+# Small JSON state files (caches, last known paths, checkpoints) live in a per-user directory.
+# Set BV_STATE_DIR to put them somewhere else.
+APP_NAME = "BlightVeil"
+
+
+def get_state_dir():
+    base = os.environ.get("BV_STATE_DIR")
+    if not base:
+        root = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")
+        base = os.path.join(root, APP_NAME)
+    os.makedirs(base, exist_ok=True)
+    return base
+
+
+def state_path(filename):
+    return os.path.join(get_state_dir(), filename)
+
+
+def load_state(filename, default=None):
+    """Read a JSON state file, returning `default` if it is missing or unreadable."""
+    try:
+        with open(state_path(filename), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_state(filename, data):
+    """Write a JSON state file atomically so a crash never leaves it half written."""
+    path = state_path(filename)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
@@ -0,0 +1,84 @@
+import os
+import sys
+import zipfile
+import hashlib
+import logging
+import threading
+from app_state import get_state_dir
+
+# Resources ship either as a resources/ folder or as resources.zip next to the code
+BASE_PATH = sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+RESOURCE_DIR = os.path.join(BASE_PATH, "resources")
+RESOURCE_ARCHIVE = os.path.join(BASE_PATH, "resources.zip")
+CACHE_DIRNAME = "assets"
+
+log = logging.getLogger(__name__)
+
+_photos = {}  # (filename, size) -> PhotoImage, reused for every window that shows it
+_lock = threading.Lock()
+_render_lock = threading.Lock()  # The background prepare thread and the GUI may ask for the same image at once
+
+
+def cache_dir():
+    path = os.path.join(get_state_dir(), CACHE_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def resource_path(filename):
+    """Path of a resource file, extracting it from resources.zip into the cache on first use."""
+    path = os.path.join(RESOURCE_DIR, filename)
+    if os.path.exists(path) or not os.path.exists(RESOURCE_ARCHIVE):
+        return path
+    extracted = os.path.join(cache_dir(), filename)
+    with _lock:
+        if not os.path.exists(extracted):
+            try:
+                with zipfile.ZipFile(RESOURCE_ARCHIVE) as archive:
+                    data = archive.read(f"resources/{filename}")
+            except KeyError:
+                return path  # Not in the archive either; let the caller report the missing file
+            with open(extracted + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(extracted + ".tmp", extracted)
+    return extracted
+
+
+def scaled_image_path(filename, size):
+    """A PNG of the resource scaled to `size`, rendered once and cached by source hash."""
+    source = resource_path(filename)
+    with open(source, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    width, height = size
+    cached = os.path.join(cache_dir(), f"{os.path.splitext(filename)[0]}-{digest}-{width}x{height}.png")
+    if not os.path.exists(cached):
+        with _render_lock:
+            if not os.path.exists(cached):  # Rendered by the other thread while we waited
+                from PIL import Image
+                image = Image.open(source).convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+                image.save(cached + ".tmp", format="PNG")
+                os.replace(cached + ".tmp", cached)
+    return cached
+
+
+def prepare_scaled_images(requests):
+    """Render every (filename, size) in the background so the first window opens instantly too."""
+    def run():
+        for filename, size in requests:
+            try:
+                scaled_image_path(filename, size)
+            except (OSError, ValueError) as e:
+                log.warning("Could not prepare %s: %s", filename, e)
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_photo(filename, size):
+    """PhotoImage of a resource at `size`; must be called on the Tk thread."""
+    key = (filename, size)
+    photo = _photos.get(key)
+    if photo is None:
+        from PIL import Image, ImageTk
+        with Image.open(scaled_image_path(filename, size)) as image:
+            photo = ImageTk.PhotoImage(image)
+        _photos[key] = photo
+    return photo
@@ -0,0 +1,71 @@
+import os
+import time
+import queue
+import logging
+import threading
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+# Sound type -> WAV file in resources/
+SOUND_FILES = {
+    "side_main": "doorbell-1.wav",
+    "reward_room": "ALARM_BUZZ_bbi.wav",
+    "actor_death": "Wasted.wav",
+}
+# The same sound requested again within this many seconds is skipped
+DEDUPE_WINDOW = 0.75
+QUEUE_SIZE = 32
+
+
+class SoundPlayer:
+    """Plays alert sounds on a dedicated thread so the parser never waits on audio.
+
+    pygame is loaded and every sound decoded once when the worker starts. play() only queues a
+    request; the worker drops repeats of a sound that arrive within DEDUPE_WINDOW.
+    """
+
+    def __init__(self, resolve_path, sound_files=SOUND_FILES, dedupe_window=DEDUPE_WINDOW):
+        self.resolve_path = resolve_path
+        self.sound_files = sound_files
+        self.dedupe_window = dedupe_window
+        self.sounds = {}
+        self.last_played = {}
+        self.requests = queue.Queue(maxsize=QUEUE_SIZE)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def play(self, sound_type, volume=1.0):
+        try:
+            self.requests.put_nowait((sound_type, volume, time.perf_counter()))
+        except queue.Full:
+            metrics.count("sound.skipped")  # Already a backlog of alerts playing; skipping one is better than blocking
+
+    def _load(self):
+        # pygame is imported here, on the audio thread, so it never delays the window appearing
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        for sound_type, filename in self.sound_files.items():
+            try:
+                self.sounds[sound_type] = pygame.mixer.Sound(self.resolve_path(filename))
+            except (pygame.error, FileNotFoundError) as e:
+                log.error("Could not load sound '%s': %s", filename, e)
+
+    def _run(self):
+        self._load()
+        while True:
+            sound_type, volume, queued_at = self.requests.get()
+            sound = self.sounds.get(sound_type)
+            if sound is None:
+                continue
+            now = time.monotonic()
+            if now - self.last_played.get(sound_type, 0.0) < self.dedupe_window:
+                continue
+            self.last_played[sound_type] = now
+            sound.set_volume(volume)
+            sound.play()
+            metrics.observe("sound.dispatch", time.perf_counter() - queued_at)  # play() request -> playback started
@@ -0,0 +1,150 @@
+"""Parse a whole archive of Game.log backups across all CPU cores.
+
+Files are split into byte ranges that start and end on line boundaries, each
+range is parsed in a worker process into a sorted temporary file, and those
+files are merged in log timestamp order, so memory use doesn't grow with the
+size of the archive:
+
+    python backfill.py "C:/.../StarCitizen/LIVE/logbackups" -o season.jsonl
+"""
+import os
+import sys
+import json
+import time
+import heapq
+import argparse
+import tempfile
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from log_rules import RuleEngine, should_report
+from log_tail import iter_file_lines
+from replay import iter_log_files, report_throughput
+
+# Files larger than this are split into several chunks
+CHUNK_SIZE = 16 * 1024 * 1024
+# Most spill files merged at once; more chunks than this are merged in several passes
+MERGE_FAN_IN = 128
+
+# One engine per worker process, compiled on first use
+_engine = None
+
+
+# Function to split a file into (path, start, end) ranges aligned to line starts
+def file_chunks(path, chunk_size=CHUNK_SIZE):
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as log_file:
+        offset = chunk_size
+        while offset < size:
+            log_file.seek(offset)
+            log_file.readline()  # Skip to the start of the next line
+            boundary = log_file.tell()
+            if boundary >= size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+            offset = boundary + chunk_size
+    boundaries.append(size)
+    return [(path, start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def parse_chunk(path, start, end, spill_dir, include_all=False):
+    """Worker: parse one byte range into a spill file sorted by timestamp; returns (line_count, event_count, spill_path)."""
+    global _engine
+    if _engine is None:
+        _engine = RuleEngine()
+    records = []
+    lines = 0
+    for line in iter_file_lines(path, start, end):
+        lines += 1
+        for event in _engine.parse_line(line, path):
+            if include_all or should_report(event):
+                records.append(event.to_dict())
+    records.sort(key=_timestamp_key)
+    fd, spill_path = tempfile.mkstemp(suffix=".jsonl", dir=spill_dir)
+    with open(fd, "w", encoding="utf-8") as spill:
+        for record in records:
+            # The sort key goes in front so merging never has to decode the JSON
+            spill.write(_timestamp_key(record) + "\t" + json.dumps(record, ensure_ascii=False) + "\n")
+    return lines, len(records), spill_path
+
+
+def _timestamp_key(record):
+    return record.get("timestamp") or ""
+
+
+def _read_spill(path):
+    with open(path, "r", encoding="utf-8") as spill:
+        for line in spill:
+            key, _, record = line.partition("\t")
+            yield key, record
+
+
+def merge_spills(spill_paths, spill_dir, fan_in=MERGE_FAN_IN):
+    """Yield the JSON lines of every spill file in timestamp order, with at most fan_in files open at once."""
+    while len(spill_paths) > fan_in:
+        merged = []
+        for index in range(0, len(spill_paths), fan_in):
+            group = spill_paths[index:index + fan_in]
+            fd, merged_path = tempfile.mkstemp(suffix=".jsonl", dir=spill_dir)
+            with open(fd, "w", encoding="utf-8") as spill:
+                for key, record in heapq.merge(*map(_read_spill, group), key=itemgetter(0)):
+                    spill.write(key + "\t" + record)
+            for path in group:
+                os.remove(path)
+            merged.append(merged_path)
+        spill_paths = merged
+    for _, record in heapq.merge(*map(_read_spill, spill_paths), key=itemgetter(0)):
+        yield record
+
+
+def backfill(paths, output, workers=None, include_all=False, chunk_size=CHUNK_SIZE):
+    stats = {"files": 0, "lines": 0, "events": 0, "bytes": 0}
+    start = time.perf_counter()
+
+    chunks = []
+    for path in iter_log_files(paths):
+        stats["files"] += 1
+        stats["bytes"] += os.path.getsize(path)
+        chunks.extend(file_chunks(path, chunk_size))
+
+    # Biggest chunks first so one large file doesn't leave the other workers idle at the end
+    chunks.sort(key=lambda chunk: chunk[2] - chunk[1], reverse=True)
+    with tempfile.TemporaryDirectory(prefix="backfill-") as spill_dir:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(parse_chunk, path, chunk_start, chunk_end, spill_dir, include_all)
+                       for path, chunk_start, chunk_end in chunks]
+            spill_paths = []
+            for future in futures:
+                lines, events, spill_path = future.result()
+                stats["lines"] += lines
+                stats["events"] += events
+                spill_paths.append(spill_path)
+
+        for record in merge_spills(spill_paths, spill_dir):
+            output.write(record)
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse many Game.log files in parallel and merge events by timestamp.")
+    parser.add_argument("paths", nargs="+", help="Game.log files, logbackups directories or glob patterns")
+    parser.add_argument("-o", "--output", help="Write events to this file instead of stdout")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_SIZE // (1024 * 1024), help="Split files into chunks of this size")
+    parser.add_argument("--all", action="store_true", help="Emit every matched event, not just the ones the GUI reports")
+    args = parser.parse_args(argv)
+
+    chunk_size = args.chunk_mb * 1024 * 1024
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            stats = backfill(args.paths, output, args.workers, args.all, chunk_size)
+    else:
+        stats = backfill(args.paths, sys.stdout, args.workers, args.all, chunk_size)
+    report_throughput(stats)
+
+
+if __name__ == "__main__":
+    main()
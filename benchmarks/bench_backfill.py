@@ -0,0 +1,47 @@
+"""Scaling of backfill.py with the number of worker processes.
+
+Run from the repository root:  python benchmarks/bench_backfill.py [--files N] [--lines N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backfill import backfill
+from synthetic_log import synthetic_lines
+
+
+class _NullOutput:
+    def write(self, text):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--lines", type=int, default=200_000, help="Lines per file")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma separated worker counts to try")
+    parser.add_argument("--chunk-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(args.files):
+            with open(os.path.join(directory, f"Game-{index:03d}.log"), "w", encoding="utf-8") as log_file:
+                log_file.writelines(synthetic_lines(args.lines, seed=index))
+
+        print(f"cpu count: {os.cpu_count()}")
+        baseline = None
+        for workers in (int(value) for value in args.workers.split(",")):
+            start = time.perf_counter()
+            stats = backfill([directory], _NullOutput(), workers=workers, chunk_size=args.chunk_mb * 1024 * 1024)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>2} workers  {stats['lines'] / elapsed:>12,.0f} lines/s  "
+                  f"{stats['bytes'] / elapsed / 1e6:>7.1f} MB/s  speedup {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Fan-out throughput of the event broadcast server to many loopback clients.
+
+Run from the repository root:  python benchmarks/bench_broadcast.py [--clients 20] [--events 100000] [--slow 1]
+
+The "slow" clients read a little and then sleep, to show that they only lose
+their own events and don't hold up publishing or the other clients.
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from broadcast import BroadcastServer
+
+
+def subscriber(port, counts, index, done, slow=False):
+    with socket.create_connection(("127.0.0.1", port)) as connection:
+        counts[index] = 0
+        reader = connection.makefile("rb")
+        while not done.is_set():
+            line = reader.readline()
+            if not line:
+                break
+            counts[index] += 1
+            if slow and counts[index] % 100 == 0:
+                time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--slow", type=int, default=1, help="How many of the clients read slowly")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--buffer", type=int, default=1000, help="Per-client send buffer, in events")
+    args = parser.parse_args()
+
+    server = BroadcastServer("127.0.0.1", 0, buffer_size=args.buffer).start()
+    counts = {}
+    done = threading.Event()
+    for index in range(args.clients):
+        threading.Thread(target=subscriber, args=(server.port, counts, index, done, index < args.slow), daemon=True).start()
+    while len(server.subscribers) < args.clients or len(counts) < args.clients:
+        time.sleep(0.01)
+
+    record = {"event": "actor_death", "source": "LIVE", "timestamp": "2025-02-21T20:01:02.123Z", "actor_name": "Victim",
+              "actor_id": "1", "zone": "p2l4_contestedzone", "killer_name": "Killer", "killer_id": "2",
+              "weapon": "behr_rifle_ballistic_01", "weapon_class": "Class unknown", "damage_type": "Bullet"}
+    start = time.perf_counter()
+    for n in range(args.events):
+        record["actor_id"] = str(n)
+        server.publish(record)
+    publish_time = time.perf_counter() - start
+
+    # Wait until every fast client has caught up (or stopped making progress)
+    fast = [index for index in range(args.clients) if index >= args.slow]
+    last = None
+    while True:
+        total = sum(counts[index] for index in fast)
+        if total >= args.events * len(fast) or total == last:
+            break
+        last = total
+        time.sleep(0.2)
+    delivery_time = time.perf_counter() - start
+    done.set()
+
+    drops = {subscriber.address[1]: subscriber.dropped for subscriber in server.subscribers}
+    print(f"publish       {args.events / publish_time:>12,.0f} events/s  ({args.events:,} events, {publish_time:.2f}s)")
+    print(f"fan-out       {total / delivery_time:>12,.0f} deliveries/s to {len(fast)} fast clients "
+          f"({total:,}/{args.events * len(fast):,} delivered)")
+    if args.slow:
+        slow_received = [counts[index] for index in range(args.slow)]
+        print(f"slow clients  received {slow_received}, {sum(drops.values()):,} events dropped in total")
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
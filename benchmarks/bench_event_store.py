@@ -0,0 +1,77 @@
+"""Ingest rate and query latency of the SQLite event store.
+
+Run from the repository root:  python benchmarks/bench_event_store.py [--rows 10000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_store import EventStore
+
+
+def synthetic_records(count, seed=42):
+    rng = random.Random(seed)
+    players = [f"Player_{n}" for n in range(5000)]
+    weapons = [f"weapon_{n}" for n in range(60)]
+    zones = [f"zone_{n}" for n in range(200)]
+    for n in range(count):
+        yield {
+            "event": "actor_death",
+            "timestamp": f"2025-{1 + n * 12 // count:02d}-{1 + (n // 1000) % 28:02d}T{(n // 100) % 24:02d}:00:00.{n % 1000:03d}Z",
+            "actor_name": rng.choice(players),
+            "killer_name": rng.choice(players),
+            "weapon": rng.choice(weapons),
+            "damage_type": "Bullet",
+            "zone": rng.choice(zones),
+            "source": "bench",
+        }
+
+
+def timed_query(label, func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"{label:<40} median {times[len(times) // 2] * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", help="Keep the database at this path instead of a temp file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = EventStore(args.db or os.path.join(directory, "bench.db"))
+        live_rows = min(args.rows, 100_000)
+        start = time.perf_counter()
+        for record in synthetic_records(live_rows, seed=1):
+            store.add(record)
+        store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"live ingest (indexed)  {live_rows:,} rows: {elapsed:.1f}s ({live_rows / elapsed:,.0f} rows/s)")
+
+        start = time.perf_counter()
+        with store.bulk_load():
+            for record in synthetic_records(args.rows):
+                store.add(record)
+        elapsed = time.perf_counter() - start
+        print(f"bulk ingest + reindex  {args.rows:,} rows: {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+        timed_query("top killers of one player", lambda: store.top_killers(victim="Player_7"))
+        timed_query("top killers of one player, last month", lambda: store.top_killers(victim="Player_7", since="2025-12-01"))
+        timed_query("history of one killer (100 rows)", lambda: store.history(killer="Player_9"))
+        timed_query("history in one zone (100 rows)", lambda: store.history(zone="zone_3"))
+        timed_query("one hour window", lambda: store.history(since="2025-06-10T05:00", until="2025-06-10T06:00"))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
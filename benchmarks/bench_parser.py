@@ -0,0 +1,74 @@
+"""Lines/sec of the old per-line regex cascade vs the compiled RuleEngine.
+
+Run from the repository root:  python benchmarks/bench_parser.py [--lines N]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_rules import RuleEngine, should_report
+from synthetic_log import synthetic_lines
+
+# The pre-RuleEngine matching logic, minus the GUI side effects
+def legacy_parse(line):
+    hits = 0
+    if "TransitCarriageStartTransit" in line or "TransitCarriageFinishTransit" in line:
+        if "Opened:" in line or "Closed:" in line:
+            re.search(r"TransitManager_TransitDungeon([^\s]+)", line)
+        for token in ("TransitDungeonExfil", "TransitDungeonRewardRoom_", "TransitDungeonSideEntrance",
+                      "TransitDungeonMainEntrance", "TransitDungeonMaintenance",
+                      "TransitDungeonExfil", "TransitDungeonRewardRoom_", "TransitDungeonSideEntrance",
+                      "TransitDungeonMainEntrance", "TransitDungeonMaintenance", "TransitManager_Maintenance",
+                      "TransitManager_DungeonEntranceA_", "TransitManager_DungeonEntranceB",
+                      "TransitManager_DungeonEntranceC"):
+            if token in line:
+                hits += 1
+    patterns = {
+        "vehicle_destroy": r"Destruction> CVehicle::OnAdvanceDestroyLevel: Vehicle '([^']+)' \[([^\]]+)\] in zone '([^']+)' .*caused by '([^']+)' \[([^\]]+)\] with '([^']+)'",
+        "actor_death": r"CActor::Kill: '([^']+)' \[([^\]]+)\] in zone '([^']+)' killed by '([^']+)' \[([^\]]+)\] using '([^']+)' \[([^']+)\] with damage type '([^']+)'",
+        "qt": r".*-- Entity Trying To QT: ([^\s]+)",
+    }
+    for key, pattern in patterns.items():
+        if re.search(pattern, line):
+            hits += 1
+    return hits
+
+
+def measure(label, func, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(lines) / best
+    print(f"{label:<12} {rate:>14,.0f} lines/sec  ({best * 1000:.1f} ms for {len(lines):,} lines)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--event-ratio", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = synthetic_lines(args.lines, args.event_ratio)
+    engine = RuleEngine()
+
+    def engine_parse(line):
+        for event in engine.parse_line(line):
+            should_report(event)
+
+    before = measure("legacy", legacy_parse, lines, args.repeat)
+    after = measure("RuleEngine", engine_parse, lines, args.repeat)
+    print(f"speedup      {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
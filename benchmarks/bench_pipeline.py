@@ -0,0 +1,184 @@
+"""Headless benchmark of the live parse path: throughput, per-rule cost, tail latency and memory.
+
+Run from the repository root:  python benchmarks/bench_pipeline.py [--size-mb 100] [--mix kill=2,noise=90]
+
+Lines go through the same steps as in the GUI (RuleEngine -> should_report ->
+ElevatorTracker -> SinkPipeline), with the gui/flash/sound sinks replaced by
+stubs so nothing needs a display or an audio device.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elevators import ElevatorTracker
+from log_monitor import LogMonitor
+from log_rules import RuleEngine, should_report
+from log_tail import LogTailer, iter_file_lines
+from sinks import Sink, SinkPipeline
+from stats import LiveStats
+from synthetic_log import DEFAULT_MIX, NOISE, QT, TEMPLATES, iter_lines, parse_mix, write_log
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+
+class Parser:
+    """parse_kill_line from blightveil_gui.py, publishing into a pipeline of stub sinks."""
+
+    def __init__(self, gui_handler=None):
+        self.engine = RuleEngine()
+        self.tracker = ElevatorTracker()
+        self.stats = LiveStats()
+        self.published = 0
+        self.pipeline = SinkPipeline()
+        self.pipeline.add(Sink("gui", gui_handler or (lambda event: None)))
+        self.pipeline.add(Sink("flash", lambda event: None, accepts={"elevator_alert"}))
+        self.pipeline.add(Sink("sound", lambda event: None, accepts={"elevator_alert"}))
+        self.pipeline.add(Sink("stats", self.stats.add_event))
+
+    def parse(self, line, source=None):
+        for event in self.engine.parse_line(line, source):
+            if should_report(event) and self.tracker.accept(event):
+                self.published += 1
+                self.pipeline.publish(event)
+
+    def dropped(self):
+        return sum(sink.dropped for sink in self.pipeline.sinks.values())
+
+    def close(self):
+        self.pipeline.close()
+
+
+def bench_throughput(path):
+    parser = Parser()
+    size = os.path.getsize(path)
+    lines = 0
+    start = time.perf_counter()
+    for line in iter_file_lines(path):
+        parser.parse(line)
+        lines += 1
+    elapsed = time.perf_counter() - start
+    parser.close()
+    print(f"throughput    {lines / elapsed:>12,.0f} lines/s  {size / elapsed / 1e6:>7.1f} MB/s  "
+          f"({lines:,} lines, {parser.published:,} events, {parser.dropped():,} dropped by sinks)")
+
+
+def bench_rules(samples, repeat):
+    """Cost of RuleEngine.parse_line for each kind of line on its own."""
+    engine = RuleEngine()
+    print("per-rule cost (RuleEngine.parse_line)")
+    for kind in TEMPLATES:
+        lines = [line for _, line in iter_lines(samples, mix={kind: 1.0}, seed=7)]
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for line in lines:
+                engine.parse_line(line)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"  {kind:<10} {best / samples * 1e9:>8,.0f} ns/line")
+
+
+def bench_latency(directory, rate, seconds, noise_per_event):
+    """Time from a QT line being written to Game.log until the gui sink handles it."""
+    path = os.path.join(directory, "Game.log")
+    open(path, "w").close()
+    written = {}
+    latencies = []
+
+    def on_event(event):
+        sent = written.get(event.entity_name)
+        if sent is not None:
+            latencies.append(time.perf_counter() - sent)
+
+    parser = Parser(on_event)
+    monitor = LogMonitor(lambda source, lines: [parser.parse(line, source) for line in lines])
+    monitor.add("LIVE", LogTailer(path, from_end=False))
+    monitor.start()
+
+    interval = 1.0 / rate
+    filler = NOISE[0].format(ts="2025-02-21T20:00:00.000Z") + "\n"
+    with open(path, "a", encoding="utf-8") as log_file:
+        deadline = time.perf_counter() + seconds
+        n = 0
+        while time.perf_counter() < deadline:
+            log_file.write(filler * noise_per_event)
+            log_file.write(QT[0].format(ts="2025-02-21T20:00:00.000Z", n=n) + "\n")  # entity_name is Ship_<n>
+            written[f"Ship_{n}"] = time.perf_counter()
+            log_file.flush()
+            n += 1
+            time.sleep(interval)
+    time.sleep(0.5)  # Let the last lines through
+    monitor.stop()
+    parser.close()
+
+    if not latencies:
+        print("tail latency  no events arrived")
+        return
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"tail latency  p50 {statistics.median(latencies) * 1000:.2f} ms  p99 {p99 * 1000:.2f} ms  "
+          f"max {latencies[-1] * 1000:.2f} ms  ({len(latencies):,}/{n:,} events at {rate:g}/s)")
+
+
+def bench_memory(path):
+    """Peak Python allocations while parsing the whole file (tracemalloc slows the run down)."""
+    parser = Parser()
+    tracemalloc.start()
+    for line in iter_file_lines(path):
+        parser.parse(line)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    parser.close()
+    report = f"peak memory   {peak / 1024 / 1024:.1f} MiB traced"
+    if resource:
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        report += f", {maxrss / scale:.1f} MiB max RSS"
+    print(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=100, help="Size of the generated Game.log")
+    parser.add_argument("--log", help="Benchmark an existing Game.log instead of generating one")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Weights per line kind, e.g. kill=2,qt=1,noise=90")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--rule-samples", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=200, help="Events per second written during the latency run")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--noise-per-event", type=int, default=20)
+    parser.add_argument("--skip", default="", help="Comma separated sections to skip: throughput,rules,latency,memory")
+    args = parser.parse_args()
+    skip = set(filter(None, args.skip.split(",")))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.log
+        if not path:
+            path = os.path.join(directory, "synthetic.log")
+            start = time.perf_counter()
+            counts = write_log(path, int(args.size_mb * 1024 * 1024), args.mix, args.seed)
+            print(f"generated     {os.path.getsize(path) / 1e6:.0f} MB, {sum(counts.values()):,} lines in "
+                  f"{time.perf_counter() - start:.1f}s  ({', '.join(f'{kind}={count:,}' for kind, count in counts.items())})")
+        if "throughput" not in skip:
+            bench_throughput(path)
+        if "rules" not in skip:
+            bench_rules(args.rule_samples, args.repeat)
+        if "latency" not in skip:
+            bench_latency(directory, args.rate, args.seconds, args.noise_per_event)
+        if "memory" not in skip:
+            bench_memory(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time from launching blightveil_gui.py to its window being visible, plus the slowest imports.
+
+Needs a display. Run from the repository root:  python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "blightveil_gui.py")
+
+
+def time_to_window():
+    env = dict(os.environ, BV_STARTUP_BENCH="1")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, SCRIPT], cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.startswith("startup: window visible"):
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError("blightveil_gui.py exited without showing its window")
+    process.stdout.close()
+    process.wait()
+    return elapsed
+
+
+def slowest_imports(count):
+    """Run once under -X importtime and return the imports with the largest cumulative time."""
+    env = dict(os.environ, BV_STARTUP_BENCH="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    return rows[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=15, help="How many of the slowest imports to list")
+    args = parser.parse_args()
+
+    times = sorted(time_to_window() for _ in range(args.runs))
+    print(f"window visible: median {times[len(times) // 2] * 1000:.0f} ms, best {times[0] * 1000:.0f} ms over {args.runs} runs")
+    print("\nslowest imports (-X importtime, cumulative):")
+    for cumulative_us, self_us, name in slowest_imports(args.imports):
+        print(f"{cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
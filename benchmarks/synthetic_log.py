@@ -0,0 +1,96 @@
+"""Seeded generator of realistic Game.log traffic.
+
+Run from the repository root:  python benchmarks/synthetic_log.py OUT.log [--size-mb 100] [--mix kill=2,noise=90]
+
+The same seed and mix always produce the same file. Lines are streamed, so
+multi-GB logs can be written without holding them in memory.
+"""
+import argparse
+import random
+
+NOISE = [
+    "<{ts}> [Notice] <Spawn Flow> CSCPlayerPUSpawningComponent::UnregisterFromExternalSystems: Player 'Someone' [201990000000] lost reservation for spawnpoint Gen_Bed [Team_CoreGameplayFeatures][Missions][Comms]",
+    "<{ts}> [Notice] <Context Establisher Done> establisher=\"CReplicationModel\" runningTime=0.512 numRuns=1 [Team_Network][Network][Replication]",
+    "<{ts}> [Notice] <CEntityComponentInstancedInterior::OnEntityLeaveZone> [InstancedInterior] OnEntityLeaveZone - InstancedInterior [Hangar_LargeFront] [5012] -> Entity [PU_Pilots-Human] [2019] [Team_(Delete)][Cat_Interior]",
+    "<{ts}> [Notice] <AttachmentReceived> Player[Someone] Attachment[body_01_noMagicPocket, body_01_noMagicPocket, 200] Status[persistent] Port[Body_ItemPort] [Team_CoreGameplayFeatures][Inventory]",
+]
+KILL = [
+    "<{ts}> [Notice] <Actor Death> CActor::Kill: 'Victim_{n}' [{n}] in zone 'p2l4_contestedzone' killed by 'Killer_{n}' [{n}] using 'behr_rifle_ballistic_01_{n}' [Class unknown] with damage type 'Bullet' from direction x: 0.1, y: 0.2, z: 0.3 [Team_ActorTech][Actor]",
+]
+VEHICLE = [
+    "<{ts}> [Notice] <Vehicle Destruction> CVehicle::OnAdvanceDestroyLevel: Vehicle 'ANVL_Arrow_{n}' [{n}] in zone 'OOC_Stanton_2a_Cellin' [pos x: 1, y: 2, z: 3 vel x: 0, y: 0, z: 0] driven by 'Pilot_{n}' [{n}] advanced from destroy level 0 to 1 caused by 'PU_Human' [{n}] with 'Combat' [Team_VehicleFeatures][Vehicle]",
+]
+QT = [
+    "<{ts}> [Notice] <Quantum Drive> -- Entity Trying To QT: Ship_{n} [Team_Navigation]",
+]
+ELEVATOR = [
+    "<{ts}> [Notice] <TransitCarriageStartTransit> Carriage 0 (Id: {n}) for manager TransitManager_TransitDungeonSideEntrance_Chek Opened: started transit [Team_Transit]",
+    "<{ts}> [Notice] <TransitCarriageFinishTransit> Carriage 0 (Id: {n}) for manager TransitManager_TransitDungeonSideEntrance_Chek Closed: finished transit [Team_Transit]",
+    "<{ts}> [Notice] <TransitCarriageStartTransit> Carriage 1 (Id: {n}) for manager TransitManager_TransitDungeonRewardRoom_Exec Opened: started transit [Team_Transit]",
+    "<{ts}> [Notice] <TransitCarriageFinishTransit> Carriage 1 (Id: {n}) for manager TransitManager_Maintenance_Hangar Closed: finished transit [Team_Transit]",
+]
+# Line kind -> templates; the names are what --mix accepts
+TEMPLATES = {"kill": KILL, "vehicle": VEHICLE, "qt": QT, "elevator": ELEVATOR, "noise": NOISE}
+# Roughly a busy contested-zone session: one line in twenty is something the parser cares about
+DEFAULT_MIX = {"kill": 1.5, "vehicle": 0.5, "qt": 1.0, "elevator": 2.0, "noise": 95.0}
+
+
+def parse_mix(text):
+    """'kill=2,noise=90' -> {"kill": 2.0, "noise": 90.0}; kinds left out get weight 0."""
+    mix = dict.fromkeys(TEMPLATES, 0.0)
+    for part in filter(None, text.split(",")):
+        kind, _, weight = part.partition("=")
+        if kind not in TEMPLATES:
+            raise ValueError(f"unknown line kind {kind!r} (expected one of {', '.join(TEMPLATES)})")
+        mix[kind] = float(weight)
+    return mix
+
+
+def iter_lines(count=None, size_bytes=None, mix=DEFAULT_MIX, seed=1234):
+    """Yield (kind, line) pairs until `count` lines or `size_bytes` bytes have been produced."""
+    rng = random.Random(seed)
+    kinds = [kind for kind in TEMPLATES if mix.get(kind)]
+    weights = [mix[kind] for kind in kinds]
+    written = 0
+    n = 0
+    while (count is None or n < count) and (size_bytes is None or written < size_bytes):
+        kind = rng.choices(kinds, weights)[0]
+        ts = f"2025-02-21T{(n // 3_600_000) % 24:02d}:{(n // 60000) % 60:02d}:{(n // 1000) % 60:02d}.{n % 1000:03d}Z"
+        line = rng.choice(TEMPLATES[kind]).format(ts=ts, n=n) + "\n"
+        written += len(line)
+        n += 1
+        yield kind, line
+
+
+def synthetic_lines(count, event_ratio=0.05, seed=1234):
+    """`count` lines in memory, with `event_ratio` of them spread evenly over the event kinds."""
+    share = event_ratio / (len(TEMPLATES) - 1)
+    mix = {kind: share for kind in TEMPLATES}
+    mix["noise"] = 1.0 - event_ratio
+    return [line for _, line in iter_lines(count, mix=mix, seed=seed)]
+
+
+def write_log(path, size_bytes, mix=DEFAULT_MIX, seed=1234):
+    """Write a Game.log of about size_bytes; returns {kind: line count}."""
+    counts = dict.fromkeys(TEMPLATES, 0)
+    with open(path, "w", encoding="utf-8", newline="\n") as log_file:
+        for kind, line in iter_lines(size_bytes=size_bytes, mix=mix, seed=seed):
+            counts[kind] += 1
+            log_file.write(line)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--size-mb", type=float, default=100)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Weights per line kind, e.g. kill=2,qt=1,noise=90")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    counts = write_log(args.output, int(args.size_mb * 1024 * 1024), args.mix, args.seed)
+    print(f"{args.output}: {sum(counts.values()):,} lines  " + "  ".join(f"{kind}={count:,}" for kind, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,326 +1,279 @@
-import re
 import os
-import ast
 import sys
 import time
-import json
-import psutil
-import pygame
-import pystray
-import requests
+import atexit
+import queue
+import logging
 import threading
 import tkinter as tk
-from PIL import Image, ImageTk
-from pystray import MenuItem as item
 from tkinter import messagebox, scrolledtext
+from log_rules import RuleEngine
+from kill_filters import BUNDLED_FILTERS, filters_path, load_filters
+from log_tail import LogTailer
+from log_monitor import LogMonitor
+from log_scan import prefilter_tokens, search_events
+from audio import SoundPlayer
+from zone_store import ZoneMappingStore
+from log_locator import locate_game_logs
+from sinks import Sink, JsonlSink, SinkPipeline
+from event_store import EventStore, STORED_EVENTS
+from broadcast import BroadcastServer, BroadcastClient, parse_address
+from stats import LiveStats
+from elevators import ElevatorTracker
+from zone_registry import load_registry, RegistryWatcher
+from metrics import metrics
+from app_state import state_path
+import assets
+
+# Diagnostics go through logging; BV_LOG_LEVEL=DEBUG shows every parsed event (off by default, it costs throughput)
+logging.basicConfig(level=os.environ.get("BV_LOG_LEVEL", "WARNING").upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+log = logging.getLogger("blightveil")
 
 # Global variables
 show_parsed_only = True
 debug_mode = False
-pygame.mixer.init()
-last_log = {}
-contested_elevator_tracking = {}  # Dictionary to track carriages
-elevator_door_states = {}  # Dictionary to track door open/close state
-elevator_states = {}
+elevator_tracker = ElevatorTracker()  # Per-elevator state; only real transitions reach the sinks
+catchup_tracker = ElevatorTracker(dedupe_window=0)  # Same for a resumed backlog, kept apart from the live dedupe window
 SC_LOG_LOCATION = None 
-monitor_thread = None 
+log_monitor = None  # Follows every found Game.log (LIVE, PTU, ...) on one thread
+TAIL_CHECKPOINT_FILE = "tail_checkpoint_{}.json"  # Read offset of each channel's Game.log, kept in the state directory
+# Parser -> GUI message queue, drained in batches every GUI_TICK_MS
+GUI_QUEUE_SIZE = 5000
+GUI_TICK_MS = 50
+GUI_MAX_BATCH = 1000
+gui_queue = queue.Queue(maxsize=GUI_QUEUE_SIZE)
+gui_dropped = 0  # Messages dropped because the queue was full
+gui_dropped_reported = 0
+# The status box keeps at most STATUS_LINE_CAP lines; older lines are trimmed in chunks of STATUS_TRIM_LINES.
+# Set BV_STATUS_HISTORY to a file path to also keep the full session history on disk.
+STATUS_LINE_CAP = int(os.environ.get("BV_STATUS_LINE_CAP", "2000"))
+STATUS_TRIM_LINES = max(1, STATUS_LINE_CAP // 10)
+STATUS_HISTORY_FILE = os.environ.get("BV_STATUS_HISTORY")
+status_line_count = 0
+status_history = None
 monitoring = True
-# URL for dynamic zone mappings
-zone_mappings_url = "https://raw.githubusercontent.com/BossGamer09/BVLogParcer/refs/heads/main/zone_mappings.json"
+# Map icon flashing: event name -> flash-until time, drawn by a single flash_tick timer
+FLASH_DURATION = 5.0
+FLASH_INTERVAL_MS = 500
+flash_until = {}
+flash_phase = False
+map_icons = {}  # Event name -> (canvas, oval id, reset colour) for icons on open map windows
+open_map_windows = set()  # Names of the map windows currently open; sounds only play while one is
 get_version_ur = "https://raw.githubusercontent.com/BossGamer09/BVLogParcer/refs/heads/main/version.txt"
-# Initialize zone_mappings dictionary
-zone_mappings = {}
-# Global variables
-checkmate_icon_positions = {
-    "Chek_TransitDungeon_Exfil": (380, 169, "green"),
-    "Chek_TransitDungeonRewardRoom": (249, 241, "yellow"),
-    "Chek_TransitDungeonSideEntrance": (533, 77, "red"),
-    "Chek_TransitDungeonMainEntrance": (729, 272, "red"),
-    "Chek_TransitDungeonMaintenance_1": (554, 151, "orange"),
-    "Chek_TransitDungeonMaintenance_2": (656, 291, "orange"),
-}
-
-obituary_icon_positions = {
-    "Orb_TransitDungeon_Exfil": (375, 212, "green"),
-    "Orb_TransitDungeonRewardRoom": (537, 37, "yellow"),
-    "Orb_TransitDungeonEntranceC": (352, 491, "red"),
-    "Orb_TransitDungeonEntranceB": (620, 346, "red"),
-    "Orb_TransitDungeonEntranceA": (273, 351, "red"),
-    "Orb_TransitDungeonMaintenance": (415, 508, "orange"),
-}
+# Zone code -> readable name; see zone_store.py
+zone_store = ZoneMappingStore()
+# Maps, icon positions and elevator alerts come from zone_registry.json (hot-reloaded)
+zone_registry = load_registry()
+map_icon_positions = {name: info["icons"] for name, info in zone_registry["maps"].items()}
+
+# Compiled once at startup (and again when the registry changes); see log_rules.py for the event rules
+rule_engine = RuleEngine(elevator_alerts=zone_registry["alerts"])
+# Which kills/vehicle kills are reported comes from kill_filters.json (hot-reloaded, see kill_filters.py)
+KILL_FILTERS_FILE = filters_path()
+kill_filters_error = None
+try:
+    report_filter = load_filters(KILL_FILTERS_FILE)
+except (OSError, ValueError) as e:
+    # A broken per-user file mustn't stop the app; the stock filters apply until it's fixed (and hot-reloaded)
+    kill_filters_error = e
+    report_filter = load_filters(BUNDLED_FILTERS)
+
+# Parsed events fan out to these sinks (see setup_sinks).
+# BV_EVENT_LOG=<file> adds a JSON-lines sink; BV_DISABLED_SINKS=sound,flash,store turns sinks off.
+event_pipeline = SinkPipeline()
+EVENT_LOG_FILE = os.environ.get("BV_EVENT_LOG")
+live_stats = LiveStats()
+STATS_REFRESH_MS = 1000
+DISABLED_SINKS = [name.strip() for name in os.environ.get("BV_DISABLED_SINKS", "").split(",") if name.strip()]
+
+# Squad event sharing (see broadcast.py): BV_BROADCAST_PORT=<port> serves our events to others,
+# BV_BROADCAST_CONNECT=host[:port],... shows the events of other members' copies.
+# The server has no authentication and only listens on this machine; set BV_BROADCAST_BIND=0.0.0.0 (or a
+# LAN address) to let other machines connect.
+BROADCAST_PORT = os.environ.get("BV_BROADCAST_PORT")
+BROADCAST_BIND = os.environ.get("BV_BROADCAST_BIND", "127.0.0.1")
+BROADCAST_CONNECT = [address.strip() for address in os.environ.get("BV_BROADCAST_CONNECT", "").split(",") if address.strip()]
+broadcast_clients = []
+# Event name -> status box tag for events received from other members
+REMOTE_EVENT_TAGS = {"actor_death": "purple1", "vehicle_destroy": "red", "qt": "blue", "elevator_alert": "orange", "elevator_door": "yellow"}
+
+# Performance overlay (see metrics.py); BV_METRICS_DUMP=<file> also writes the metrics there on exit
+METRICS_REFRESH_MS = 1000
+METRICS_SAMPLE_EVERY = 16
+lines_until_sample = 0  # Carried across batches, since a live batch is usually a single line
+METRICS_DUMP_FILE = os.environ.get("BV_METRICS_DUMP")
+metrics_window = None
+if METRICS_DUMP_FILE:
+    atexit.register(metrics.dump, METRICS_DUMP_FILE)  # on_closing ends with sys.exit(), so not after mainloop
 
 # Helper function to handle resource paths dynamically
 def get_resource_path(filename):
-    base_path = sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(__file__)
-    resource_path = os.path.join(base_path, 'resources', filename)
-    print(f"Looking for resource at: {resource_path}")  # Debugging line
-    return resource_path
-
-# Function to check if a process is running
-def check_if_process_running(process_name):
-    return next((proc.info['exe'] for proc in psutil.process_iter(['name', 'exe']) 
-                 if process_name.lower() in proc.info['name'].lower()), None)
-
-# Function to find the Game.log file
-def find_game_log(directory):
-    for path in [os.path.join(directory, 'Game.log'), os.path.join(os.path.dirname(directory), 'Game.log')]:
-        if os.path.exists(path):
-            return path
-    return None
+    return assets.resource_path(filename)  # resources/ folder, or extracted from resources.zip
 
 # Function to set the SC_LOG_LOCATION
 def set_sc_log_location():
     global SC_LOG_LOCATION
-    rsi_launcher_path = check_if_process_running("RSI Launcher")
-    if not rsi_launcher_path:
-        update_status("RSI Launcher not running.")
-        print("RSI Launcher not found.")
-        return None
-
-    sc_launcher_path = check_if_process_running("StarCitizen")
-    if not sc_launcher_path:
-        update_status("Star Citizen not running.")
-        print("Star Citizen Launcher not found.")
-        return None
-
-    log_path = find_game_log(os.path.dirname(sc_launcher_path))
-    if log_path:
-        SC_LOG_LOCATION = log_path
-        os.environ['SC_LOG_LOCATION'] = log_path
-        update_status(f"Game.log found: {log_path}")
-        print(f"Game.log found at: {log_path}")
-        return log_path  # Return the log path here
+    logs, reason = locate_game_logs()  # Cached/common paths first; process scan only as a fallback
+    if logs:
+        SC_LOG_LOCATION = logs[0][1]
+        os.environ['SC_LOG_LOCATION'] = os.pathsep.join(path for _, path, _ in logs)
+        for channel, log_path, source in logs:
+            update_status(f"Game.log found ({channel}): {log_path} (via {source})")
+            log.info("Game.log found at: %s", log_path)
+        return logs  # [(channel, path, source), ...]
     else:
-        update_status("Game.log not found.")
-        print("Game.log not found in expected locations.")
-        return None  # Ensure we return None if not found
-
-# Function to handle contested zone elevator log parsing and icon updates for all elevators
-def parse_contested_zone_elevator(line):
-    global last_log, elevator_door_states  # Use the global last_log and elevator_door_states
-
-    # Check for TransitCarriageStartTransit or TransitCarriageFinishTransit before processing
-    if "TransitCarriageStartTransit" in line or "TransitCarriageFinishTransit" in line:
-        # Handle door state changes for all elevators
-        if "Opened:" in line or "Closed:" in line:
-            match = re.search(r"TransitManager_TransitDungeon([^\s]+)", line)
-            if match:
-                manager_id = match.group(1)
-
-                # First "Opened:" state for any elevator (side, main, maintenance, or reward room)
-                if "Opened:" in line:
-                    if manager_id not in elevator_door_states:  # First "Opened" state for this elevator
-                        elevator_door_states[manager_id] = 'opened'
-                        print(f"Event: {manager_id} Opened for the first time")
-                        highlight_log(f"🚪 **Elevator Opened**: {manager_id}", 'yellow')
-
-                elif "Closed:" in line:
-                    if manager_id in elevator_door_states and elevator_door_states[manager_id] != 'closed':
-                        elevator_door_states[manager_id] = 'closed'
-                        print(f"Event: {manager_id} Closed")
-                        highlight_log(f"🚪 **Elevator Closed**: {manager_id}", 'yellow')
-
-        # Handle exiting the contested zone (Exfil event)
-        if "TransitDungeonExfil" in line:
-            print("Event: TransitDungeonExfil")  # Debug: print event name
-            highlight_log(f"🚪 **Exit Notice**: Someone has exited the Contested Zone (CZ)", 'red')
-            flash_icon("Chek_TransitDungeon_Exfil", checkmate_icon_positions)
-            play_sound("actor_death")  # Play death sound for exfil event
-
-        # Handle loot room (Reward Room) events
-        if "TransitDungeonRewardRoom_" in line:
-            print("Event: TransitDungeonRewardRoom")  # Debug: print event name
-            highlight_log(f"💎 **Loot Room Alert**: Someone is in a Loot Room", 'yellow')
-            flash_icon("Chek_TransitDungeonRewardRoom", checkmate_icon_positions)
-            play_sound("reward_room")  # Play sound for reward room alert
-
-        # Handle each elevator type using simple if statements
-        if "TransitDungeonSideEntrance" in line:
-            print("Event: TransitDungeonSideEntrance")  # Debug: print event name
-            highlight_log(f"🚪 **Side Entrance Alert**: Someone is at the Side Entrance", 'red')
-            flash_icon("Chek_TransitDungeonSideEntrance", checkmate_icon_positions)
-            play_sound("side_main")  # Play sound for side entrance
-
-        if "TransitDungeonMainEntrance" in line:
-            print("Event: TransitDungeonMainEntrance")  # Debug: print event name
-            highlight_log(f"🚪 **Main Entrance Alert**: Someone is at the Main Entrance", 'red')
-            flash_icon("Chek_TransitDungeonMainEntrance", checkmate_icon_positions)
-            play_sound("side_main")  # Play sound for main entrance
-
-        if "TransitDungeonMaintenance" in line:
-            print("Event: TransitDungeonMaintenance")  # Debug: print event name
-            highlight_log(f"🚪 **Maintenance Alert**: Someone is at the Maintenance Entrance", 'orange')
-            flash_icon("Chek_TransitDungeonMaintenance_1", checkmate_icon_positions)
-            play_sound("side_main")  # Play sound for maintenance entrance
-        
-        if "TransitDungeonExfil" in line:
-            print("Event: TransitDungeonExfil")  # Debug: print event name
-            highlight_log(f"🚪 **Exit Notice**: Someone has exited the Contested Zone (CZ)", 'red')
-            flash_icon("Orb_TransitDungeon_Exfil", obituary_icon_positions)
-            play_sound("actor_death")  # Play death sound for exfil event
-
-        # Handle loot room (Reward Room) events
-        if "TransitDungeonRewardRoom_" in line:
-            print("Event: TransitDungeonRewardRoom")  # Debug: print event name
-            highlight_log(f"💎 **Loot Room Alert**: Someone is in a Loot Room", 'yellow')
-            flash_icon("Orb_TransitDungeonRewardRoom", obituary_icon_positions)
-            play_sound("reward_room")  # Play sound for reward room alert
-
-        # Handle each elevator type using simple if statements
-        if "TransitDungeonSideEntrance" in line:
-            print("Event: TransitDungeonSideEntrance")  # Debug: print event name
-            highlight_log(f"🚪 **Side Entrance Alert**: Someone is at the Side Entrance", 'red')
-            flash_icon("Orb_TransitDungeonSideEntrance", obituary_icon_positions)
-            play_sound("side_main")
-
-        if "TransitDungeonMainEntrance" in line:
-            print("Event: TransitDungeonMainEntrance")  # Debug: print event name
-            highlight_log(f"🚪 **Main Entrance Alert**: Someone is at the Main Entrance", 'red')
-            flash_icon("Orb_TransitDungeonMainEntrance", obituary_icon_positions)
-            play_sound("side_main")
-
-        if "TransitDungeonMaintenance" in line:
-            print("Event: TransitDungeonMaintenance")  # Debug: print event name
-            highlight_log(f"🚪 **Maintenance Alert**: Someone is at the Maintenance Entrance", 'orange')
-            flash_icon("Orb_TransitDungeonMaintenance_1", obituary_icon_positions)
-            play_sound("side_main")
-
-        # Handle Obituary Entrance Elevators
-        if "TransitManager_Maintenance" in line:
-            print("Event: TransitManager_Maintenance")
-            highlight_log(f"🚪 **Obituary Maintenance Alert**: Someone is at the Maintenance Elevator", 'orange')
-            flash_icon("Orb_TransitDungeonMaintenance", obituary_icon_positions)
-            play_sound("side_main")
-
-        if "TransitManager_DungeonEntranceA_" in line:
-            print("Event: TransitManager_DungeonEntranceA_")
-            highlight_log(f"🚪 **Obituary Dungeon Entrance A Alert**: Someone is at Dungeon Entrance A", 'red')
-            flash_icon("Orb_TransitDungeonEntranceA", obituary_icon_positions)
-            play_sound("side_main")
-
-        if "TransitManager_DungeonEntranceB" in line:
-            print("Event: TransitManager_DungeonEntranceB")
-            highlight_log(f"🚪 **Obituary Dungeon Entrance B Alert**: Someone is at Dungeon Entrance B", 'red')
-            flash_icon("Orb_TransitDungeonEntranceB", obituary_icon_positions)
-            play_sound("side_main")
-
-        if "TransitManager_DungeonEntranceC" in line:
-            print("Event: TransitManager_DungeonEntranceC")
-            highlight_log(f"🚪 **Obituary Dungeon Entrance C Alert**: Someone is at Dungeon Entrance C", 'red')
-            flash_icon("Orb_TransitDungeonEntranceC", obituary_icon_positions)
-            play_sound("side_main")
+        update_status(reason)
+        log.warning("Game.log not found: %s", reason)
+        return []  # Ensure we return an empty list if not found
+
+# Prefix for status lines once more than one Game.log is being followed
+def source_tag(event):
+    if log_monitor and len(log_monitor.sources) > 1 and event.source:
+        return f"[{event.source}] "
+    return ""
+
+# Function to handle contested zone elevator events and icon updates for all elevators
+def handle_elevator_door(event):
+    # Only real open/close transitions get here (see ElevatorTracker)
+    log.debug("Event: %s %s", event.manager_id, event.state)
+    highlight_log(f"{source_tag(event)}🚪 **Elevator {event.state.title()}**: {event.manager_id}", 'yellow')
+
+def handle_elevator_alert(event):
+    alert = event.alert
+    log.debug("Event: %s", alert["token"])
+    highlight_log(source_tag(event) + alert["message"], alert["color"])
+
+# Handlers for the "flash" and "sound" sinks
+def flash_event_icons(event):
+    for map_name, icon_name in event.alert["icons"]:
+        flash_icon(icon_name, map_icon_positions[map_name])
+
+def play_event_sound(event):
+    play_sound(event.alert["sound"])
 
 # Function to flash icons on the map for specific events
 def flash_icon(event_name, icon_positions):
-    """Flash the appropriate icon based on the event."""
+    """Flash the appropriate icon based on the event.
+
+    Only records a flash-until deadline (safe from the parser thread); flash_tick
+    does the drawing. A repeat event extends the running flash instead of
+    starting another chain of timers.
+    """
     if icon_positions is not None and event_name in icon_positions:
-        x, y, reset_color = icon_positions[event_name]
-        icon = icons.get(event_name)
-        if icon:
-            def toggle_flash(count):
-                # Toggle between white and the original color
-                current_color = "white" if count % 2 == 0 else reset_color
-                canvas.itemconfig(icon, fill=current_color)  # Ensure this is updating the right icon
-
-                # Continue flashing for more cycles
-                if count < 10:  # Flash 10 times
-                    canvas.after(500, toggle_flash, count + 1)  # 500ms delay between flashes
-                else:
-                    # Reset to the original color after flashing
-                    canvas.itemconfig(icon, fill=reset_color)
-            # Start flashing (starting count = 0)
-            toggle_flash(0)
+        flash_until[event_name] = time.monotonic() + FLASH_DURATION
+    else:
+        log.warning("Icon for event '%s' not found in icon_positions.", event_name)
+
+def flash_tick():
+    """Toggle every flashing icon between white and its colour; runs every FLASH_INTERVAL_MS."""
+    global flash_phase
+    tick_start = time.perf_counter()
+    flash_phase = not flash_phase
+    now = time.monotonic()
+    for event_name, deadline in list(flash_until.items()):
+        drawn = map_icons.get(event_name)
+        if now >= deadline and flash_until.get(event_name) == deadline:
+            del flash_until[event_name]  # Unless the parser extended it meanwhile
+        if not drawn:
+            continue  # Map isn't open; the deadline just runs out
+        map_canvas, icon, reset_color = drawn
+        if now < deadline:
+            map_canvas.itemconfig(icon, fill="white" if flash_phase else reset_color)
         else:
-            print(f"Warning: Icon for event '{event_name}' not found in icons.")  # Debugging line
+            # Reset to the original color after flashing
+            map_canvas.itemconfig(icon, fill=reset_color)
+    if flash_until:
+        metrics.observe("flash.tick", time.perf_counter() - tick_start)
+    root.after(FLASH_INTERVAL_MS, flash_tick)
+
+def register_map_icons(map_canvas, icons, icon_positions):
+    for name, icon in icons.items():
+        map_icons[name] = (map_canvas, icon, icon_positions[name][2])
+
+def unregister_map_icons(icons):
+    for name in icons:
+        map_icons.pop(name, None)
+
+# Function to load zone mappings instantly from the local cache/bundled file, then refresh them in the background
+def load_zone_mappings():
+    source = zone_store.load()
+    if source:
+        update_status(f"Loaded {len(zone_store.mappings)} zone mappings ({source}).")
     else:
-        print(f"Warning: Icon for event '{event_name}' not found in icon_positions.")  # Debugging line
-        
-def fetch_zone_mappings():
-    global zone_mappings  # Ensure it's modifying the global variable
-    try:
-        update_status("Fetching zone mappings from URL...")
-        response = requests.get(zone_mappings_url)  # Only call this once
+        update_status("❗ No local zone mappings found; zone codes will be shown as-is until the refresh finishes.")
+    zone_store.refresh_in_background(update_status)
 
-        if response.status_code == 200:
-            zone_mappings = ast.literal_eval(response.text)
+def handle_actor_death(event):
+    zone = event.zone
+    log.debug("Captured kill: %r", event)
 
-            # Debug: print the mappings to check if they are parsed correctly
-            update_status(f"Zone mappings: {zone_mappings}")
-        else:
-            update_status(f"Error fetching zone mappings. Status Code: {response.status_code}")
-    
-    except Exception as e:
-        update_status(f"Error loading zone mappings: {e}")
+    # Ensure the zone name is mapped correctly
+    zone_name = zone_store.get(zone, zone)  # Use zone from mapping or default to the zone itself
 
-def parse_kill_line(line, flash_icon, icon_positions):
-    print(f"Parsing line: {line}")
-    global show_parsed_only
-    global zone_mappings
+    highlight_log(f"{source_tag(event)}💀 **Actor Death**: {event.actor_name} killed by {event.killer_name} using {event.weapon} with damage type {event.damage_type} in zone {zone_name}", 'purple')
 
-    patterns = {
-        "vehicle_destroy": r"Destruction> CVehicle::OnAdvanceDestroyLevel: Vehicle '([^']+)' \[([^\]]+)\] in zone '([^']+)' .*caused by '([^']+)' \[([^\]]+)\] with '([^']+)'",  # Adjusted pattern for vehicle destruction
-        "actor_death": r"CActor::Kill: '([^']+)' \[([^\]]+)\] in zone '([^']+)' killed by '([^']+)' \[([^\]]+)\] using '([^']+)' \[([^']+)\] with damage type '([^']+)'",  # Updated pattern for actor death
-        "qt": r".*-- Entity Trying To QT: ([^\s]+)",  # Adjusted
-    }
+def handle_vehicle_destroy(event):
+    zone = event.zone
+    log.debug("Captured vehicle destruction: %r", event)
+
+    # Ensure the zone name is mapped correctly
+    zone_name = zone_store.get(zone, zone)  # Use zone from mapping or default to the zone itself
+
+    highlight_log(f"{source_tag(event)}🚗 **Vehicle Destruction**: {event.vehicle_name} destroyed by {event.destroyer_name} due to {event.destruction_type} in zone {zone_name}", 'red')
+
+def handle_qt(event):
+    log.debug("Entity trying to QT: %s", event.entity_name)
+    highlight_log(f"{source_tag(event)}🚀 **Quantum Travel**: {event.entity_name} trying to QT", 'blue')
+
+# Event name -> status box handler (run by the "gui" sink); new event types get a rule in log_rules.py and an entry here
+event_handlers = {
+    "actor_death": handle_actor_death,
+    "vehicle_destroy": handle_vehicle_destroy,
+    "qt": handle_qt,
+    "elevator_door": handle_elevator_door,
+    "elevator_alert": handle_elevator_alert,
+}
+
+def show_event(event):
+    handler = event_handlers.get(event.name)
+    if handler:
+        handler(event)
+
+# Function to register the consumers of parsed events; each sink runs on its own thread
+def setup_sinks():
+    event_pipeline.add(Sink("gui", metrics.timed("sink.gui", show_event)))
+    # Flashes, sounds, live stats and the squad broadcast are only for events happening now, not a caught-up backlog
+    event_pipeline.add(Sink("flash", metrics.timed("sink.flash", flash_event_icons), accepts={"elevator_alert"}, live_only=True))
+    event_pipeline.add(Sink("sound", metrics.timed("sink.sound", play_event_sound), accepts={"elevator_alert"}, live_only=True))
+    event_pipeline.add(Sink("stats", live_stats.add_event, live_only=True))
+    if EVENT_LOG_FILE:
+        event_pipeline.add(JsonlSink(EVENT_LOG_FILE))
+    if BROADCAST_PORT:
+        try:
+            server = BroadcastServer(BROADCAST_BIND, int(BROADCAST_PORT)).start()
+        except (OSError, ValueError) as e:
+            log.error("Event broadcast not started on port %s: %s", BROADCAST_PORT, e)
+        else:
+            # Runs on the sink's own thread; slow clients only lose their own events (see BroadcastServer)
+            event_pipeline.add(Sink("broadcast", metrics.timed("sink.broadcast", server.publish_event), live_only=True))
+            log.info("Broadcasting events on %s:%s", BROADCAST_BIND, server.port)
+    if "store" not in DISABLED_SINKS:
+        # Kill/vehicle/QT history for event_store.py queries; rows are committed once per burst
+        store = EventStore()
+        event_pipeline.add(Sink("store", store.add_event, accepts=STORED_EVENTS, on_idle=store.flush))
+    for name in DISABLED_SINKS:
+        event_pipeline.set_enabled(name, False)
+
+def parse_kill_line(line, source=None, catchup=False):
+    publish_events(rule_engine.parse_line(line, source), catchup)
+
+def publish_events(events, catchup=False):
+    tracker = catchup_tracker if catchup else elevator_tracker
+    for event in events:
+        if report_filter(event) and tracker.accept(event):
+            metrics.count("events." + event.name)
+            event_pipeline.publish(event, catchup)  # Sinks do the GUI/sound/flash work off the parse thread
 
-    parse_contested_zone_elevator(line)
-
-    matched = False  
-    for key, pattern in patterns.items():
-        if match := re.search(pattern, line):
-            matched = True
-            if key == "actor_death":
-                actor_name = match.group(1)
-                actor_id = match.group(2)  # Actor ID captured from the log
-                zone = match.group(3)
-                killer_name = match.group(4)
-                killer_id = match.group(5)  # Killer ID captured from the log
-                weapon = match.group(6)  # Weapon used in the death
-                class_unknown = match.group(7)  # The class is captured
-                damage_type = match.group(8)  # Damage type captured
-
-                # Check if the actor or killer is PU_Human and avoid logging if PU_Human kills PU_Human
-                if actor_name == "PU_Human" and killer_name == "PU_Human":
-                    # Ignore this case (no logging)
-                    continue
-                if actor_name == "Kopion" and killer_name != "PU_Human":
-                    #Ignore this case (no logging)
-                    continue
-                if killer_name == "PU_Human" and actor_name != "Kopion":
-                    # Ignore this case (no logging)
-                    continue
-                else:
-                    # Log the event if PU_Human is involved but not killing another PU_Human
-                    print(f"Captured kill: {actor_name} ({actor_id}) killed by {killer_name} ({killer_id}) using {weapon} with damage type {damage_type} in zone {zone}")
-
-                    # Ensure the zone name is mapped correctly
-                    zone_name = zone_mappings.get(zone, zone)  # Use zone from mapping or default to the zone itself
-                    print(f"Mapped zone: {zone_name}")  # Debug print for zone mapping
-
-                    highlight_log(f"💀 **Actor Death**: {actor_name} killed by {killer_name} using {weapon} with damage type {damage_type} in zone {zone_name}", 'purple')
-
-            if key == "vehicle_destroy":
-                vehicle_name = match.group(1)
-                vehicle_id = match.group(2)  # Vehicle ID captured from the log
-                zone = match.group(3)
-                destroyer_name = match.group(4)
-                destroyer_id = match.group(5)  # Destroyer ID captured from the log
-                destruction_type = match.group(6)  # Destruction cause (e.g., 'Combat')
-
-                # Check if the destroyer is PU_Human
-                if destroyer_name == "PU_Human":
-                    print(f"Captured vehicle destruction: {vehicle_name} ({vehicle_id}) destroyed by {destroyer_name} ({destroyer_id}) due to {destruction_type} in zone {zone}")
-
-                    # Ensure the zone name is mapped correctly
-                    zone_name = zone_mappings.get(zone, zone)  # Use zone from mapping or default to the zone itself
-                    print(f"Mapped zone: {zone_name}")  # Debug print for zone mapping
-
-                    highlight_log(f"🚗 **Vehicle Destruction**: {vehicle_name} destroyed by {destroyer_name} due to {destruction_type} in zone {zone_name}", 'red')
-            if key == "qt":
-                entity_name = match.group(1)  # Entity attempting to Quantum Travel
-                print(f"Entity trying to QT: {entity_name}")  # Debugging QT capture
-                highlight_log(f"🚀 **Quantum Travel**: {entity_name} trying to QT", 'blue')        
-            
 def toggle_parsed_only():
     global show_parsed_only
     show_parsed_only = not show_parsed_only
@@ -338,82 +291,228 @@ def setup_highlight_tags():
     for tag, description in colors.items():
         status_text.tag_configure(tag, foreground=tag)  # Tag name and color
 
+# Map the color to the tag name (which was defined in setup_highlight_tags)
+color_tags = {
+    'red': 'red',
+    'purple': 'purple1',
+    'green': 'green',
+    'orange': 'orange',
+    'yellow': 'yellow',
+    'blue': 'blue',
+}
+
 def highlight_log(message, color):
     """Highlight log messages with different colors."""
-    status_text.config(state=tk.NORMAL)
-
-    # Map the color to the tag name (which was defined earlier)
-    if color == 'red':
-        tag = 'red'
-    elif color == 'purple':
-        tag = 'purple1'  # Choose 'purple1' or 'purple2' based on your logic
-    elif color == 'green':
-        tag = 'green'
-    elif color == 'orange':
-        tag = 'orange'
-    elif color == 'yellow':
-        tag = 'yellow'
-    elif color == 'blue':
-        tag = 'blue'
-    else:
-        tag = None  # No tag if color is not recognized
+    post_message(message, color_tags.get(color))  # No tag if color is not recognized
 
-    # Insert the message with the appropriate tag using after to schedule the update
-    def insert_message():
-        if tag:
-            status_text.insert(tk.END, message + "\n", tag)
+def post_message(message, tag=None):
+    """Queue a message for the status box; safe to call from any thread."""
+    global gui_dropped
+    try:
+        gui_queue.put_nowait((message, tag))
+    except queue.Full:
+        gui_dropped += 1  # Newest messages are dropped while the GUI catches up
+
+def drain_gui_queue():
+    """Insert every pending message in one go; re-schedules itself every GUI_TICK_MS."""
+    global gui_dropped_reported
+    tick_start = time.perf_counter()
+    metrics.gauge("gui.queue_depth", gui_queue.qsize())
+    pending = []
+    try:
+        while len(pending) < GUI_MAX_BATCH:
+            pending.append(gui_queue.get_nowait())
+    except queue.Empty:
+        pass
+
+    # Coalesce runs of identical messages into one line with a repeat count
+    lines = []
+    for message, tag in pending:
+        if lines and lines[-1][0] == message and lines[-1][1] == tag:
+            lines[-1][2] += 1
         else:
-            status_text.insert(tk.END, message + "\n")  # Default, no color
+            lines.append([message, tag, 1])
+
+    dropped = gui_dropped
+    if dropped != gui_dropped_reported:
+        lines.append([f"⚠️ GUI is behind: {dropped - gui_dropped_reported} message(s) dropped ({dropped} total)", 'orange', 1])
+        gui_dropped_reported = dropped
+
+    if lines:
+        texts = []
+        status_text.config(state=tk.NORMAL)
+        for message, tag, count in lines:
+            text = message + (f" (x{count})" if count > 1 else "") + "\n"
+            texts.append(text)
+            if tag:
+                status_text.insert(tk.END, text, tag)
+            else:
+                status_text.insert(tk.END, text)  # Default, no color
+        trim_status_lines(sum(text.count("\n") for text in texts))  # A message can span several lines
         status_text.config(state=tk.DISABLED)
         status_text.yview(tk.END)
+        spill_status_history(texts)
+        metrics.observe("gui.drain", time.perf_counter() - tick_start)
+        metrics.count("gui.lines", len(texts))
+    metrics.gauge("gui.dropped", dropped)
+
+    status_text.after(GUI_TICK_MS, drain_gui_queue)
+
+def trim_status_lines(added):
+    """Keep the status box capped at STATUS_LINE_CAP lines, deleting the oldest in bulk."""
+    global status_line_count
+    status_line_count += added
+    # Only trim once a whole chunk is over the cap, so deletes stay rare and insert cost stays flat
+    if status_line_count >= STATUS_LINE_CAP + STATUS_TRIM_LINES:
+        excess = status_line_count - STATUS_LINE_CAP
+        status_text.delete("1.0", f"{excess + 1}.0")
+        status_line_count -= excess
+
+def spill_status_history(texts):
+    """Append the lines to STATUS_HISTORY_FILE (if set) so trimmed lines aren't lost."""
+    global status_history
+    if not STATUS_HISTORY_FILE:
+        return
+    try:
+        if status_history is None:
+            status_history = open(STATUS_HISTORY_FILE, "a", encoding="utf-8")
+        status_history.write("".join(texts))
+        status_history.flush()
+    except OSError as e:
+        log.error("Could not write status history: %s", e)
+
+def refresh_stats_panel():
+    """Redraw the stats panel; cost is the same however many events came in."""
+    stats_label.config(text=live_stats.summary(zone_store.mappings))
+    root.after(STATS_REFRESH_MS, refresh_stats_panel)
+
+# Called from a tailer when the game rewrote its Game.log (e.g. after a relaunch)
+def on_log_reopened(channel, reopen_count):
+    update_status(f"🔄 {channel} Game.log was rewritten, reading the new log from the start. (reopens: {reopen_count})")
+
+# Called from a tailer when it picks up where the previous run stopped
+def on_log_resumed(channel, offset, size):
+    update_status(f"⏩ Resuming {channel} Game.log from the last checkpoint ({(size - offset) / 1024:.0f} KB to catch up).")
+
+def on_log_error(channel, error):
+    update_status(f"❗ Stopped following the {channel} Game.log: {error}")
+
+# Called on the monitor thread with each batch of new lines; every log shares the one rule engine and GUI queue
+def parse_lines(channel, lines, catchup=False):
+    global lines_until_sample
+    if not metrics.enabled:
+        for line in lines:
+            parse_kill_line(line, channel, catchup)  # Parse kill log lines
+        return
+    # Same as above, timing one line in METRICS_SAMPLE_EVERY under the rule it matched ("rule.miss" for the rest);
+    # timing every line would cost more than the parsing being measured
+    clock = time.perf_counter
+    parse_line = rule_engine.parse_line
+    batch_start = clock()
+    for line in lines:
+        if lines_until_sample:
+            lines_until_sample -= 1
+            publish_events(parse_line(line, channel), catchup)
+            continue
+        lines_until_sample = METRICS_SAMPLE_EVERY - 1
+        start = clock()
+        events = parse_line(line, channel)
+        elapsed = clock() - start
+        metrics.observe("rule." + rule_engine.rule_name(line) if events else "rule.miss", elapsed)
+        publish_events(events, catchup)
+    metrics.observe("tail.batch", clock() - batch_start)
+    metrics.count("tail.lines", len(lines))
+    metrics.count("tail.batches")
+
+# Lines written while the tool was stopped (see LogTailer.catching_up); kept out of the live-only sinks
+def parse_catchup_lines(channel, lines):
+    parse_lines(channel, lines, catchup=True)
+
+# Function to create the tailer for one Game.log
+def tail_log(channel, log_file_location):
+    # Resume from the last checkpoint of this log if there is one, else start reading from the end of the file
+    return LogTailer(
+        log_file_location,
+        on_reopen=lambda count: on_log_reopened(channel, count),
+        checkpoint_file=TAIL_CHECKPOINT_FILE.format(channel.lower()),
+        on_resume=lambda offset, size: on_log_resumed(channel, offset, size),
+        catchup_tokens=prefilter_tokens(rule_engine),  # A big backlog is caught up with the mmap token scan
+    )
+
+# Search box: finds earlier events in the Game.log(s) with the mmap token scan (see log_scan.py)
+SEARCH_RESULT_LIMIT = 200
+
+def describe_event(event):
+    return describe_record(event.to_dict())
+
+def describe_record(record):
+    fields = {key: value for key, value in record.items() if key not in ("event", "source", "timestamp") and value}
+    return f"{record.get('timestamp') or '?'} {record.get('event')}: " + ", ".join(f"{key}={value}" for key, value in fields.items())
+
+# Events received from another member's copy (BV_BROADCAST_CONNECT); shown only, never re-broadcast
+def show_remote_event(address, record):
+    if record.get("event") == "elevator_alert":
+        text = f"{record.get('message')} ({record.get('manager_id')})"
+    else:
+        text = describe_record(record)
+    post_message(f"📡 [{address}] {text}", REMOTE_EVENT_TAGS.get(record.get("event")))
+
+def search_history(event=None):
+    query = search_entry.get().strip()
+    if not query:
+        return
 
-    status_text.after(0, insert_message)  # Schedule the update on the main thread
-    print(f"Highlighting log: {message}")
+    # Scanning a large log takes a few seconds, so it runs off the GUI thread like the monitor does
+    def search_thread_func():
+        if log_monitor and log_monitor.running:
+            paths = [tailer.path for tailer in log_monitor.tailers.values()]
+        else:
+            paths = [path for _, path, _ in locate_game_logs()[0]]
+        if not paths:
+            update_status("❗ No Game.log found to search.")
+            return
+        start = time.perf_counter()
+        try:
+            results = search_events(paths, rule_engine, query, SEARCH_RESULT_LIMIT)
+        except (OSError, ValueError) as e:
+            update_status(f"❗ Search failed: {e}")
+            return
+        for found in results:
+            post_message(f"🔎 {describe_event(found)}", 'blue')
+        more = f" (showing the last {SEARCH_RESULT_LIMIT})" if len(results) == SEARCH_RESULT_LIMIT else ""
+        update_status(f"🔎 {len(results)} event(s) matching '{query}' in {time.perf_counter() - start:.1f}s{more}.")
 
-# Function to tail the Game.log file and parse the lines
-def tail_log(log_file_location, flash_icon, icon_positions):
-    global monitoring
-    with open(log_file_location, "r") as log_file:
-        log_file.seek(0, os.SEEK_END)  # Start reading from the end of the file
-        while monitoring:
-            line = log_file.readline()  # Read new line from log file
-            if line:
-                parse_kill_line(line, flash_icon, icon_positions)  # Parse kill log lines
-            else:
-                time.sleep(1)  # Wait for new lines in the log file
+    threading.Thread(target=search_thread_func, daemon=True).start()
 
 # Function to start monitoring the Game.log file
-def start_monitoring(flash_icon=None, icon_positions=None):
-    global monitoring, monitor_thread
+def start_monitoring():
+    # One monitor at a time; a second would publish every event twice and share its checkpoint files
+    if log_monitor and log_monitor.running:
+        update_status("Monitoring is already running.")
+        return
 
     # Disable the Start button to prevent multiple clicks
     start_button.config(state=tk.DISABLED)
 
     # Start the monitoring in a separate thread to keep the GUI responsive
     def monitor_thread_func():
-        # Display connecting message
-        update_status("Connecting to fetch zone mappings...")
-
-        # Fetch zone mappings in a separate thread
-        fetch_zone_mappings()
-
-        if not zone_mappings:  # Check if zone mappings were successfully fetched
-            update_status("Error: Zone mappings could not be loaded.")
-            start_button.config(state=tk.NORMAL)  # Re-enable Start button
-            return
-
-        # Zone mappings fetched successfully, proceed with log monitoring
-        log_file = set_sc_log_location()  # This will now return the log path
-        if log_file:
+        global monitoring, log_monitor
+        if log_monitor:
+            log_monitor.join()  # Let a stopped monitor finish closing its logs first
+        # Zone mappings are loaded at startup and refreshed in the background, so go straight to the log
+        logs = set_sc_log_location()  # Every channel with a recent Game.log
+        if logs:
             monitoring = True
-            monitor_thread = threading.Thread(target=tail_log, args=(log_file, flash_icon, icon_positions), daemon=True)
-            monitor_thread.start()
-            update_status("Monitoring started.")
+            log_monitor = LogMonitor(parse_lines, on_error=on_log_error, on_catchup=parse_catchup_lines)
+            for channel, log_file, _ in logs:
+                log_monitor.add(channel, tail_log(channel, log_file))
+            log_monitor.start()
+            update_status(f"Monitoring started ({', '.join(log_monitor.sources)}).")
 
             # Enable the buttons once everything is set up
             stop_button.config(state=tk.NORMAL)     # Enable the Stop button
-            checkmate_button.config(state=tk.NORMAL)  # Enable the Checkmate button
-            obituary_button.config(state=tk.NORMAL)  # Enable the Obituary button
+            for map_button in map_buttons.values():
+                map_button.config(state=tk.NORMAL)  # Enable the map buttons
         else:
             messagebox.showerror("Error", "Game.log not found.")
             start_button.config(state=tk.NORMAL)  # Re-enable Start button
@@ -421,39 +520,78 @@ def start_monitoring(flash_icon=None, icon_positions=None):
     # Run the monitor thread function asynchronously
     threading.Thread(target=monitor_thread_func, daemon=True).start()
 
-# Function to stop monitoring
-def stop_monitoring():
+# Function to stop monitoring; wait=True blocks until the last checkpoints are written (used on exit)
+def stop_monitoring(wait=False):
     global monitoring
     monitoring = False
+    if log_monitor:
+        log_monitor.stop()
+        if wait:
+            log_monitor.join(timeout=2.0)
     update_status("Monitoring stopped.")
     
     # Disable stop button and re-enable start button
     start_button.config(state=tk.NORMAL)
     stop_button.config(state=tk.DISABLED)
 
+# Performance overlay: a small window with the hot-path metrics, toggled with the Metrics button or F3
+def toggle_metrics_overlay(event=None):
+    global metrics_window
+    if metrics_window is not None:
+        metrics_window.destroy()
+        metrics_window = None
+        return
+    metrics_window = tk.Toplevel(root)
+    metrics_window.title("Performance")
+    metrics_window.configure(bg="#1e1e1e")
+    metrics_window.attributes("-topmost", True)
+    metrics_window.protocol("WM_DELETE_WINDOW", toggle_metrics_overlay)
+    label = tk.Label(metrics_window, justify=tk.LEFT, anchor="nw", fg="#cccccc", bg="#1e1e1e", font=("Consolas", 9))
+    label.pack(padx=10, pady=5, fill=tk.BOTH, expand=True)
+    controls = tk.Frame(metrics_window, bg="#1e1e1e")
+    controls.pack(pady=5)
+    tk.Button(controls, text="Dump to File", command=dump_metrics, bg="#0078D4", fg="white").pack(side=tk.LEFT, padx=5)
+    tk.Button(controls, text="Reset", command=metrics.reset, bg="#6200EE", fg="white").pack(side=tk.LEFT, padx=5)
+    refresh_metrics_overlay(metrics_window, label)
+
+def refresh_metrics_overlay(window, label):
+    if window is not metrics_window:
+        return  # Closed (or reopened) since this refresh was scheduled
+    for name, sink in event_pipeline.sinks.items():
+        metrics.gauge(f"sink.{name}.queue_depth", sink.events.qsize())
+        metrics.gauge(f"sink.{name}.dropped", sink.dropped)
+    metrics.gauge("sound.queue_depth", sound_player.requests.qsize())
+    label.config(text=metrics.report())
+    window.after(METRICS_REFRESH_MS, refresh_metrics_overlay, window, label)
+
+def dump_metrics(path=None):
+    path = path or state_path(time.strftime("metrics-%Y%m%d-%H%M%S.json"))
+    try:
+        metrics.dump(path)
+        update_status(f"📊 Metrics written to {path}")
+    except OSError as e:
+        update_status(f"❗ Could not write metrics: {e}")
+
 # Function to update the status in the GUI
 def update_status(message):
     """Update status text in the GUI."""
-    def insert_status():
-        status_text.config(state=tk.NORMAL)
-        status_text.insert(tk.END, message + "\n")
-        status_text.config(state=tk.DISABLED)
-        status_text.yview(tk.END)
-
-    status_text.after(0, insert_status)  # Use after to ensure thread-safety
+    post_message(message)  # Drained on the GUI thread by drain_gui_queue
 
 # Function to handle the closing of the application
 def on_closing():
-    stop_monitoring()  # Ensure the monitoring thread is stopped
+    stop_monitoring(wait=True)  # Ensure the monitoring thread is stopped
     root.quit()        # Stop the Tkinter mainloop and exit the application
     sys.exit()         # Force an immediate exit
 
-# Function to set up the system tray icon
+# Function to set up the system tray icon; runs on its own thread so pystray/PIL load after the window is up
 def setup_tray():
     ico_path, _ = setup_resources()
-    if not ico_path:
-        print("Icon file not found.")
+    if not os.path.exists(ico_path):
+        log.warning("Icon file not found: %s", ico_path)
         return
+    import pystray
+    from PIL import Image
+    from pystray import MenuItem as item
     image = Image.open(ico_path)
     menu = (item('Open', lambda: root.deiconify()), item('Exit', exit_app))
     tray_icon = pystray.Icon("BlightVeil", image, menu=menu)
@@ -470,40 +608,26 @@ def get_version_file(file_name, url):
         with open(file_name, 'r') as f:
             return f.read().strip()
     except FileNotFoundError:
-        print(f"❗ {file_name} not found. Falling back to URL.")
+        log.info("%s not found. Falling back to URL.", file_name)
         return get_version_url(url)
 
 def play_sound(sound_type, volume=1.0):
-    checkmate_exists = "checkmate_window" in globals() and checkmate_window.winfo_exists()
-    obituary_exists = "obituary_window" in globals() and obituary_window.winfo_exists()
-
-    # Only play sound if either window exists
-    if checkmate_exists or obituary_exists:
-        sound_path = None
-
-        if sound_type == "side_main":
-            sound_path = get_resource_path("doorbell-1.wav")
-        elif sound_type == "reward_room":
-            sound_path = get_resource_path("ALARM_BUZZ_bbi.wav")
-        elif sound_type == "actor_death":
-            sound_path = get_resource_path("Wasted.wav")
-
-        if sound_path:
-            sound = pygame.mixer.Sound(sound_path)
-            sound.set_volume(volume)
-            sound.play()
+    # Only play sound if either map window is open (tracked on the GUI thread, no Tk calls here)
+    if open_map_windows:
+        sound_player.play(sound_type, volume)
 
 # Function to get the version from a URL
 def get_version_url(url):
+    import requests  # Only needed when version.txt is missing
     try:
         response = requests.get(url)
         if response.status_code == 200:
             return response.text.strip()
         else:
-            print(f"❗ Error fetching version from URL: {response.status_code}")
+            log.warning("Error fetching version from URL: %s", response.status_code)
             return "Version information unavailable"
     except requests.RequestException as e:
-        print(f"❗ Error fetching version from URL: {e}")
+        log.warning("Error fetching version from URL: %s", e)
         return "Version information unavailable"
 
 # Setup resources (icon and banner)
@@ -511,9 +635,9 @@ def setup_resources():
     ico_path = get_resource_path("BlightVeil.ico")
     banner_path = get_resource_path("BlightVeilBanner.png")
     if not os.path.exists(ico_path):
-        print("Icon file not found:", ico_path)
+        log.warning("Icon file not found: %s", ico_path)
     if not os.path.exists(banner_path):
-        print("Banner image not found:", banner_path)
+        log.warning("Banner image not found: %s", banner_path)
     return ico_path, banner_path
 
     # Fetch and display the version information
@@ -523,85 +647,66 @@ def setup_resources():
     else:
         update_status("❗ Version information not found")
 
-def handle_checkmate():
-    """Handle the action when the Checkmate button is clicked."""
-    update_status("Checkmate Selected")
-    
-    global checkmate_window, canvas, icons, map_photo
-    checkmate_window = tk.Toplevel(root)
-    checkmate_window.title("Checkmate View")
-    checkmate_window.geometry("800x600")  # Fixed size
-    checkmate_window.configure(bg="#1e1e1e")
-    checkmate_window.resizable(False, False)  # Lock the window size to prevent resizing
-
-    # Load the map image
-    map_image_path = get_resource_path("Star_Citizen_Contested_Zones_Checkmate_Map.jpg")
-    print(f"Loading image from: {map_image_path}")
-    map_image = Image.open(map_image_path).resize((800, 600), Image.Resampling.LANCZOS)
-    map_photo = ImageTk.PhotoImage(map_image)
+MAP_SIZE = (800, 600)
+BANNER_SIZE = (480, 100)
 
-    # Create canvas and draw image
-    canvas = tk.Canvas(checkmate_window, width=800, height=600)
-    canvas.pack(fill=tk.BOTH, expand=True)
-    
-    # Use create_image to add the image to the canvas
-    canvas.create_image(400, 300, anchor=tk.CENTER, image=map_photo)  # Center the image
+def handle_map(map_name):
+    """Handle the action when a map button is clicked."""
+    map_info = zone_registry["maps"][map_name]
+    icon_positions = map_icon_positions[map_name]
+    title = map_info["title"]
+    update_status(f"{title} Selected")
 
-    # Draw the icons on the canvas at fixed positions
-    icons = {}
-    for name, (x, y, color) in checkmate_icon_positions.items():
-        icons[name] = canvas.create_oval(x-10, y-10, x+10, y+10, fill=color, outline="white", width=2)
-
-    checkmate_button.config(state=tk.DISABLED)  # Disable the button after use
-    
-    # Re-enable the button after a delay
-    checkmate_window.protocol("WM_DELETE_WINDOW", lambda: on_checkmate_close())
-    
-    def on_checkmate_close():
-        """Handle the action when the Checkmate window is closed."""
-        checkmate_window.destroy()  # Use destroy instead of close
-        checkmate_button.config(state=tk.NORMAL)  # Re-enable the button
-        update_status("Checkmate window closed.")
-
-def handle_obituary():
-    """Handle the action when the Obituary button is clicked."""
-    update_status("Obituary Selected")
-    
-    global obituary_window, canvas, icons, map_photo
-    obituary_window = tk.Toplevel(root)
-    obituary_window.title("Obituary View")
-    obituary_window.geometry("800x600")  # Fixed size
-    obituary_window.configure(bg="#1e1e1e")
-    obituary_window.resizable(False, False)  # Lock the window size to prevent resizing
-
-    # Load the obituary map image
-    map_image_path = get_resource_path("Star_Citizen_Contested_Zones_Orbituary_Map.jpg")
-    print(f"Loading image from: {map_image_path}")
-    map_image = Image.open(map_image_path).resize((800, 600), Image.Resampling.LANCZOS)
-    map_photo = ImageTk.PhotoImage(map_image)
+    map_window = tk.Toplevel(root)
+    map_window.title(f"{title} View")
+    map_window.geometry("800x600")  # Fixed size
+    map_window.configure(bg="#1e1e1e")
+    map_window.resizable(False, False)  # Lock the window size to prevent resizing
 
     # Create canvas and draw image
-    canvas = tk.Canvas(obituary_window, width=800, height=600)
+    canvas = tk.Canvas(map_window, width=800, height=600, bg="#1e1e1e")
     canvas.pack(fill=tk.BOTH, expand=True)
-    
-    # Use create_image to add the image to the canvas
-    canvas.create_image(400, 300, anchor=tk.CENTER, image=map_photo)  # Center the image
 
-    # Draw the icons on the canvas at fixed positions for the Obituary map
+    # Pre-scaled and cached after the first use (see assets.py)
+    try:
+        map_photo = assets.get_photo(map_info["image"], MAP_SIZE)
+        canvas.create_image(400, 300, anchor=tk.CENTER, image=map_photo)  # Center the image
+    except OSError as e:
+        update_status(f"❗ Map image for {title} could not be loaded: {e}")
+
+    # Draw the icons on the canvas at fixed positions
     icons = {}
-    for name, (x, y, color) in obituary_icon_positions.items():
+    for name, (x, y, color) in icon_positions.items():
         icons[name] = canvas.create_oval(x-10, y-10, x+10, y+10, fill=color, outline="white", width=2)
-
-    obituary_button.config(state=tk.DISABLED)  # Disable the button after use
-    
-    # Re-enable the button after a delay
-    obituary_window.protocol("WM_DELETE_WINDOW", lambda: on_obituary_close())
-    
-    def on_obituary_close():
-        """Handle the action when the Obituary window is closed."""
-        obituary_window.destroy()  # Use destroy instead of close
-        obituary_button.config(state=tk.NORMAL)  # Re-enable the button
-        update_status("Obituary window closed.")
+    register_map_icons(canvas, icons, icon_positions)
+
+    map_buttons[map_name].config(state=tk.DISABLED)  # Disable the button while the map is open
+    open_map_windows.add(map_name)
+
+    def on_map_close():
+        """Handle the action when the map window is closed."""
+        unregister_map_icons(icons)
+        map_window.destroy()  # Use destroy instead of close
+        open_map_windows.discard(map_name)
+        map_buttons[map_name].config(state=tk.NORMAL)  # Re-enable the button
+        update_status(f"{title} window closed.")
+
+    map_window.protocol("WM_DELETE_WINDOW", on_map_close)
+
+# Called from the registry watcher thread when zone_registry.json changes
+def apply_zone_registry(registry):
+    global zone_registry, map_icon_positions, rule_engine
+    new_positions = {name: info["icons"] for name, info in registry["maps"].items()}
+    new_engine = RuleEngine(elevator_alerts=registry["alerts"])  # Compile before swapping in
+    zone_registry = registry
+    map_icon_positions = new_positions
+    rule_engine = new_engine  # The tail thread picks this up on its next line
+    update_status(f"🔁 Zone registry reloaded: {len(registry['maps'])} maps, {len(registry['alerts'])} alerts. New maps get a button after a restart.")
+
+# Decode all alert sounds once, on the audio thread
+sound_player = SoundPlayer(get_resource_path)
+sound_player.start()
+setup_sinks()
 
 # Initialize GUI with dark mode
 root = tk.Tk()
@@ -611,33 +716,59 @@ root.configure(bg="#1e1e1e")
 
 # Setup icon and banner resources
 ico_path, banner_path = setup_resources()
-if ico_path:
-    image = Image.open(ico_path)
-    tray_icon = pystray.Icon("BlightVeil", image, menu=(item('Open', lambda: root.deiconify()), item('Exit', exit_app)))
-    threading.Thread(target=tray_icon.run, daemon=True).start()
+threading.Thread(target=setup_tray, daemon=True).start()
 
-# Store a reference to the banner image
-banner_image = None  # Initialize a variable to hold the banner image
-if banner_path:
-    banner = Image.open(banner_path).resize((480, 100), Image.LANCZOS)
-    banner_image = ImageTk.PhotoImage(banner)  # Store the PhotoImage reference
-    label_banner = tk.Label(root, image=banner_image, bg="#1e1e1e")
-    label_banner.pack()
+# The banner label is packed now to keep its place; the image (and PIL) loads once the window is showing
+label_banner = tk.Label(root, bg="#1e1e1e", height=6)
+label_banner.pack()
+
+def load_banner():
+    if os.path.exists(banner_path):
+        banner_image = assets.get_photo("BlightVeilBanner.png", BANNER_SIZE)  # Scaled once, then read from the cache
+        label_banner.config(image=banner_image, height=0)
+    # Scale the map images in the background so even the first map window opens instantly
+    assets.prepare_scaled_images([(info["image"], MAP_SIZE) for info in zone_registry["maps"].values()])
 
 # Scrolled text box for displaying log messages
 status_text = scrolledtext.ScrolledText(root, height=8, wrap=tk.WORD, fg="white", bg="#252526", state=tk.DISABLED)
 status_text.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
 
-# Fetch version from file or URL
-version = get_version_file('version.txt', 'https://raw.githubusercontent.com/BossGamer09/BVLogParcer/refs/heads/main/version.txt')
-if version:
-    update_status(f"🔧 BlightVeil Version: {version}")
-else:
-    update_status("❗ Version information not found")
+# Live aggregates over the last few minutes, refreshed on a fixed timer
+stats_label = tk.Label(root, text="", justify=tk.LEFT, anchor="w", fg="#cccccc", bg="#1e1e1e", font=("Consolas", 9))
+stats_label.pack(padx=10, fill=tk.X)
+
+# Search box for earlier events in the current Game.log(s)
+search_frame = tk.Frame(root, bg="#1e1e1e")
+search_frame.pack(padx=10, pady=(5, 0), fill=tk.X)
+search_entry = tk.Entry(search_frame, fg="white", bg="#252526", insertbackground="white")
+search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+search_entry.bind("<Return>", search_history)
+search_button = tk.Button(search_frame, text="Search History", command=search_history, bg="#455A64", fg="white")
+search_button.pack(side=tk.LEFT, padx=(5, 0))
+
+# Fetch version from file or URL, off the GUI thread in case it has to go to the network
+def show_version():
+    version = get_version_file('version.txt', get_version_ur)
+    if version:
+        update_status(f"🔧 BlightVeil Version: {version}")
+    else:
+        update_status("❗ Version information not found")
+
+threading.Thread(target=show_version, daemon=True).start()
 
 # Set up text highlighting for different log types
 setup_highlight_tags()  # <-- Make sure to call this function to set up the tags
 
+# Zone mappings are ready before monitoring starts; the network refresh never blocks it
+load_zone_mappings()
+if kill_filters_error:
+    update_status(f"❗ Could not load kill filters from {KILL_FILTERS_FILE}: {kill_filters_error}. Using the default filters.")
+
+# Start draining queued log messages into the status box and the map icon flasher
+drain_gui_queue()
+flash_tick()
+refresh_stats_panel()
+
 # Frame for the buttons to control their placement
 button_frame = tk.Frame(root, bg="#1e1e1e")
 button_frame.pack(pady=10)
@@ -653,21 +784,56 @@ stop_button = tk.Button(button_frame, text="Stop Monitoring", command=stop_monit
 stop_button.pack(side=tk.LEFT, padx=5)
 stop_button.config(state=tk.DISABLED)  # Initially disable the Stop button
 
-# Button to open the Checkmate map below the other buttons
-checkmate_button = tk.Button(root, text="Open Checkmate Map", command=handle_checkmate, bg="#4CAF50", fg="white")
-checkmate_button.pack(pady=5)
-checkmate_button.config(state=tk.DISABLED)  # Enable the button
-
-# Button to open the Obituary map below the other buttons
-obituary_button = tk.Button(root, text="Open Obituary Map", command=handle_obituary, bg="#FF5722", fg="white")
-obituary_button.pack(pady=5)
-obituary_button.config(state=tk.DISABLED)  # Enable the button initially
+metrics_button = tk.Button(button_frame, text="Metrics", command=toggle_metrics_overlay, bg="#455A64", fg="white")
+metrics_button.pack(side=tk.LEFT, padx=5)
+root.bind("<F3>", toggle_metrics_overlay)
+
+# One button per map in zone_registry.json, below the other buttons
+map_buttons = {}
+for map_name, map_info in zone_registry["maps"].items():
+    map_button = tk.Button(root, text=f"Open {map_info['title']} Map", command=lambda name=map_name: handle_map(name),
+                           bg=map_info.get("button_color", "#4CAF50"), fg="white")
+    map_button.pack(pady=5)
+    map_button.config(state=tk.DISABLED)  # Enabled once monitoring starts
+    map_buttons[map_name] = map_button
+
+def apply_kill_filters(new_filter):
+    global report_filter
+    report_filter = new_filter  # Compiled on the watcher thread; the parser picks it up on its next event
+    update_status(f"🔁 Kill filters reloaded from {KILL_FILTERS_FILE}.")
+
+# Reload maps/alerts when zone_registry.json is edited, without restarting the tailer
+registry_watcher = RegistryWatcher(apply_zone_registry, on_error=lambda e: update_status(f"❗ Zone registry not reloaded: {e}"))
+registry_watcher.start()
+filters_watcher = RegistryWatcher(apply_kill_filters, on_error=lambda e: update_status(f"❗ Kill filters not reloaded: {e}"),
+                                  path=KILL_FILTERS_FILE, loader=load_filters)
+filters_watcher.start()
+
+for address in BROADCAST_CONNECT:
+    try:
+        host, port = parse_address(address)
+    except ValueError as e:
+        log.error("Not connecting to event broadcast %s: %s", address, e)
+        continue
+    broadcast_clients.append(BroadcastClient(host, port, on_event=lambda record, address=address: show_remote_event(address, record),
+                                             on_status=update_status).start())
 
 root.protocol("WM_DELETE_WINDOW", on_closing)  # Ensure we handle the window close event
 
+# Everything below the basic window loads after it's first drawn
+root.after_idle(load_banner)
+
+# Startup benchmark hook (benchmarks/bench_startup.py): report the first time the window is mapped, then exit
+if os.environ.get("BV_STARTUP_BENCH"):
+    def report_startup(event):
+        if event.widget is root:
+            print("startup: window visible", flush=True)
+            root.after(0, root.destroy)
+    root.bind("<Map>", report_startup)
+
 root.mainloop()
 # Stop monitoring when the main loop ends
-stop_monitoring()
+stop_monitoring(wait=True)
 # Exit the application
 sys.exit()
 # End of the script
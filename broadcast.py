@@ -0,0 +1,214 @@
+import json
+import queue
+import socket
+import logging
+import threading
+
+# Events are shared as newline-delimited JSON over plain TCP (one event per line, see Event.to_dict)
+DEFAULT_PORT = 47800
+# Per-client send buffer (in events); a client that falls this far behind loses new events until it catches up
+CLIENT_BUFFER = 1000
+# Up to this many bytes of queued events go out in one send
+BATCH_BYTES = 64 * 1024
+# A client that can't take a batch within this many seconds is disconnected
+SEND_TIMEOUT = 5.0
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+log = logging.getLogger(__name__)
+
+
+class _Subscriber:
+    """One connected client: a bounded queue of encoded lines and the thread that sends them."""
+
+    def __init__(self, server, connection, address, buffer_size):
+        self.server = server
+        self.connection = connection
+        self.address = address
+        self.pending = queue.Queue(maxsize=buffer_size)
+        self.dropped = 0
+        self.sent = 0
+        self.thread = threading.Thread(target=self._run, name=f"broadcast-{address[0]}:{address[1]}", daemon=True)
+
+    def offer(self, data):
+        try:
+            self.pending.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1  # Slow client; the publisher never waits for it
+
+    def _run(self):
+        closing = False
+        try:
+            while not closing:
+                data = self.pending.get()
+                if data is None:
+                    break
+                batch = [data]
+                size = len(data)
+                # Whatever else is already queued goes out in the same send
+                while size < self.server.batch_bytes:
+                    try:
+                        data = self.pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    if data is None:
+                        closing = True
+                        break
+                    batch.append(data)
+                    size += len(data)
+                self.connection.sendall(b"".join(batch))
+                self.sent += len(batch)
+        except OSError as e:
+            log.info("Broadcast client %s:%s disconnected: %s", self.address[0], self.address[1], e)
+        finally:
+            self.server._remove(self)
+            self.connection.close()
+
+    def close(self):
+        try:
+            self.pending.put_nowait(None)
+        except queue.Full:
+            self.connection.close()  # Unblocks a stuck sendall; the thread exits on the error
+
+
+class BroadcastServer:
+    """Shares parsed events with every connected client (e.g. the rest of the squad).
+
+    publish() encodes an event once and offers it to each client's bounded
+    queue without blocking, so a slow or stalled client only loses its own
+    events (counted in `dropped`) and never holds up the parser. Each client
+    has its own sender thread, which writes queued events in batches of up
+    to BATCH_BYTES. There is no authentication, so the server only listens on
+    loopback unless another host is given.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, buffer_size=CLIENT_BUFFER, batch_bytes=BATCH_BYTES,
+                 send_timeout=SEND_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.buffer_size = buffer_size
+        self.batch_bytes = batch_bytes
+        self.send_timeout = send_timeout
+        self.subscribers = []
+        self.published = 0
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def start(self):
+        self._listener = socket.create_server((self.host, self.port))
+        self.port = self._listener.getsockname()[1]  # The real port when started with port 0
+        threading.Thread(target=self._accept, name="broadcast-accept", daemon=True).start()
+        return self
+
+    def _accept(self):
+        while True:
+            try:
+                connection, address = self._listener.accept()
+            except OSError:
+                return  # Listener closed
+            connection.settimeout(self.send_timeout)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            subscriber = _Subscriber(self, connection, address, self.buffer_size)
+            with self._lock:
+                self.subscribers.append(subscriber)
+            subscriber.thread.start()
+
+    def _remove(self, subscriber):
+        with self._lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+
+    def publish(self, record):
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        self.published += 1
+        with self._lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(data)
+
+    def publish_event(self, event):
+        self.publish(event.to_dict())
+
+    def dropped(self):
+        with self._lock:
+            return sum(subscriber.dropped for subscriber in self.subscribers)
+
+    def close(self):
+        if self._listener:
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)  # Wakes the accept thread; close() alone doesn't on Linux
+            except OSError:
+                pass
+            self._listener.close()
+        with self._lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
+
+
+class BroadcastClient:
+    """Receives events from a BroadcastServer and calls on_event(record) for each one.
+
+    Runs on its own thread and reconnects with a backoff (RECONNECT_DELAY
+    doubling up to MAX_RECONNECT_DELAY) whenever the connection drops.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, on_event=None, on_status=None):
+        self.host = host
+        self.port = port
+        self.on_event = on_event
+        self.on_status = on_status
+        self.received = 0
+        self.stopped = threading.Event()
+        self._connection = None
+
+    def start(self):
+        threading.Thread(target=self._run, name="broadcast-client", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self._connection:
+            self._connection.close()
+
+    def _status(self, message):
+        if self.on_status:
+            self.on_status(message)
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        while not self.stopped.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=SEND_TIMEOUT) as connection:
+                    connection.settimeout(None)
+                    self._connection = connection
+                    self._status(f"Connected to event broadcast at {self.host}:{self.port}")
+                    delay = RECONNECT_DELAY
+                    for line in connection.makefile("rb"):
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if not isinstance(record, dict):
+                            continue  # Every event is a JSON object; anything else isn't from a BroadcastServer
+                        self.received += 1
+                        if self.on_event:
+                            try:
+                                self.on_event(record)
+                            except Exception:
+                                log.exception("Broadcast event handler failed on %r", record)
+                if self.stopped.is_set():
+                    return
+                self._status(f"Event broadcast at {self.host}:{self.port} closed the connection")
+            except OSError as e:
+                if self.stopped.is_set():
+                    return
+                self._status(f"Event broadcast at {self.host}:{self.port} unreachable: {e}")
+            self.stopped.wait(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+
+def parse_address(text, default_port=DEFAULT_PORT):
+    """"host:port" or "host" -> (host, port)."""
+    host, _, port = text.strip().partition(":")
+    return host or "127.0.0.1", int(port) if port else default_port
@@ -0,0 +1,83 @@
+import time
+
+# Repeats for the same elevator within this many seconds are treated as the same activation
+DEDUPE_WINDOW = 3.0
+# A trip whose finish line never arrived (e.g. Game.log rewritten mid-trip) is forgotten after this many seconds
+MOVING_TIMEOUT = 60.0
+
+
+class ElevatorState:
+    __slots__ = ("transit", "doors", "last_alert", "moving_since")
+
+    def __init__(self):
+        self.transit = "idle"  # idle -> moving -> arrived -> moving ...
+        self.doors = None  # "opened" / "closed" once seen
+        self.last_alert = None
+        self.moving_since = None
+
+
+class ElevatorTracker:
+    """Per-elevator state machine keyed by log source and TransitManager_* id.
+
+    Every carriage of an elevator logs its own Start/FinishTransit lines, so a
+    single trip shows up many times. accept() lets an event through only when it
+    moves that elevator to a new state:
+
+    * ElevatorAlert with phase "start": idle/arrived -> moving (the alert fires)
+    * ElevatorAlert with phase "finish": moving -> arrived (state only, no alert)
+    * ElevatorDoor: doors opened <-> closed
+
+    A new trip starting within DEDUPE_WINDOW of the last alert is also dropped.
+    An elevator that has been "moving" for MOVING_TIMEOUT without a finish line
+    is treated as arrived, so a lost finish can't silence it for the session.
+    """
+
+    def __init__(self, dedupe_window=DEDUPE_WINDOW, clock=time.monotonic, moving_timeout=MOVING_TIMEOUT):
+        self.dedupe_window = dedupe_window
+        self.moving_timeout = moving_timeout
+        self.clock = clock
+        self.elevators = {}
+        self.suppressed = 0
+
+    def state(self, key):
+        elevator = self.elevators.get(key)
+        if elevator is None:
+            elevator = self.elevators[key] = ElevatorState()
+        return elevator
+
+    def accept(self, event):
+        if event.name == "elevator_alert":
+            passed = self._transit(event)
+        elif event.name == "elevator_door":
+            passed = self._doors(event)
+        else:
+            return True
+        if not passed:
+            self.suppressed += 1
+        return passed
+
+    def _transit(self, event):
+        elevator = self.state((event.source, event.manager_id))  # LIVE and PTU reuse manager ids
+        if event.phase == "finish":
+            if elevator.transit == "moving":
+                elevator.transit = "arrived"
+            return False
+        now = self.clock()
+        if elevator.transit == "moving" and now - elevator.moving_since < self.moving_timeout:
+            return False
+        elevator.transit = "moving"
+        elevator.moving_since = now
+        if elevator.last_alert is not None and now - elevator.last_alert < self.dedupe_window:
+            return False
+        elevator.last_alert = now
+        return True
+
+    def _doors(self, event):
+        elevator = self.state((event.source, event.manager_id))  # LIVE and PTU reuse manager ids
+        if elevator.doors == event.state:
+            return False
+        if elevator.doors is None and event.state == "closed":
+            elevator.doors = "closed"  # Nothing to report until we've seen them open
+            return False
+        elevator.doors = event.state
+        return True
@@ -0,0 +1,201 @@
+"""Append-only SQLite history of kills, vehicle destructions and QT attempts.
+
+The GUI feeds it through the "store" sink. Offline output can be loaded and queried from the command line:
+
+    python backfill.py logbackups -o season.jsonl
+    python event_store.py import season.jsonl
+    python event_store.py top-killers --victim MyHandle --since 7d
+    python event_store.py history --killer SomeoneElse --limit 20
+"""
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from app_state import state_path
+
+DEFAULT_DB = "events.db"
+STORED_EVENTS = ("actor_death", "vehicle_destroy", "qt")
+BATCH_SIZE = 5000
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts TEXT,
+    kind TEXT NOT NULL,
+    victim TEXT,
+    killer TEXT,
+    weapon TEXT,
+    damage_type TEXT,
+    zone TEXT,
+    source TEXT
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_killer ON events (killer, ts);
+CREATE INDEX IF NOT EXISTS events_victim ON events (victim, ts);
+CREATE INDEX IF NOT EXISTS events_zone ON events (zone, ts);
+"""
+INDEX_NAMES = ("events_ts", "events_killer", "events_victim", "events_zone")
+
+INSERT = "INSERT INTO events (ts, kind, victim, killer, weapon, damage_type, zone, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+# Function to flatten an event record (dict form, see events.Event.to_dict) into a table row
+def event_row(record):
+    kind = record["event"]
+    if kind == "actor_death":
+        victim, killer, weapon, damage_type = record["actor_name"], record["killer_name"], record["weapon"], record["damage_type"]
+    elif kind == "vehicle_destroy":
+        victim, killer, weapon, damage_type = record["vehicle_name"], record["destroyer_name"], None, record["destruction_type"]
+    else:
+        victim, killer, weapon, damage_type = record.get("entity_name"), None, None, None
+    return (record.get("timestamp"), kind, victim, killer, weapon, damage_type, record.get("zone"), record.get("source"))
+
+
+# Function to turn "7d", "12h", "30m" or an ISO date into the ISO timestamp format Game.log uses
+def parse_since(value):
+    if not value:
+        return None
+    units = {"d": "days", "h": "hours", "m": "minutes"}
+    if value[-1] in units and value[:-1].isdigit():
+        moment = datetime.now(timezone.utc) - timedelta(**{units[value[-1]]: int(value[:-1])})
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return value
+
+
+class EventStore:
+    """Batched writer and query API over the events table.
+
+    add() only buffers; rows are written with executemany inside one
+    transaction when BATCH_SIZE rows are pending or flush() is called.
+    """
+
+    def __init__(self, path=None, batch_size=BATCH_SIZE):
+        self.path = path or state_path(DEFAULT_DB)
+        self.batch_size = batch_size
+        self.pending = []
+        # Written from the store sink's thread, queried from wherever the caller is
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA cache_size=-65536")  # 64 MB page cache keeps index inserts off the disk
+        self.db.executescript(TABLE + INDEXES)
+
+    def add(self, record):
+        if record["event"] not in STORED_EVENTS:
+            return
+        self.pending.append(event_row(record))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_event(self, event):
+        self.add(event.to_dict())
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        with self.db:
+            self.db.executemany(INSERT, rows)
+
+    @contextmanager
+    def bulk_load(self):
+        """Drop the indexes while loading many rows and rebuild them once at the end.
+
+        Rebuilding is several times faster than maintaining four indexes row by row.
+        """
+        for name in INDEX_NAMES:
+            self.db.execute(f"DROP INDEX IF EXISTS {name}")
+        try:
+            yield self
+            self.flush()
+        finally:
+            self.db.executescript(INDEXES)
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def top_killers(self, victim=None, since=None, zone=None, limit=10):
+        """Who killed `victim` (or anyone) most, broken down by weapon and zone."""
+        where, params = self._filters(kind="actor_death", victim=victim, zone=zone, since=since)
+        query = (f"SELECT killer, weapon, zone, COUNT(*) AS kills FROM events {where} "
+                 "GROUP BY killer, weapon, zone ORDER BY kills DESC LIMIT ?")
+        return self.db.execute(query, params + [limit]).fetchall()
+
+    def history(self, kind=None, killer=None, victim=None, zone=None, since=None, until=None, limit=100):
+        where, params = self._filters(kind=kind, killer=killer, victim=victim, zone=zone, since=since, until=until)
+        query = f"SELECT ts, kind, victim, killer, weapon, damage_type, zone FROM events {where} ORDER BY ts DESC LIMIT ?"
+        return self.db.execute(query, params + [limit]).fetchall()
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def _filters(self, since=None, until=None, **equals):
+        clauses, params = [], []
+        for column, value in equals.items():
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(parse_since(since))
+        if until:
+            clauses.append("ts < ?")
+            params.append(until)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _print_rows(rows):
+    for row in rows:
+        print("\t".join("" if value is None else str(value) for value in row))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or load the local event history.")
+    parser.add_argument("--db", help="Database file (default: events.db in the BlightVeil state directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("import", help="Load JSON-lines output of replay.py/backfill.py")
+    load.add_argument("files", nargs="+")
+
+    top = commands.add_parser("top-killers", help="Most frequent killers with weapon and zone")
+    top.add_argument("--victim")
+    top.add_argument("--zone")
+    top.add_argument("--since", help="e.g. 7d, 12h or an ISO timestamp")
+    top.add_argument("--limit", type=int, default=10)
+
+    hist = commands.add_parser("history", help="Most recent matching events")
+    hist.add_argument("--kind", choices=STORED_EVENTS)
+    hist.add_argument("--killer")
+    hist.add_argument("--victim")
+    hist.add_argument("--zone")
+    hist.add_argument("--since")
+    hist.add_argument("--until")
+    hist.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args(argv)
+    store = EventStore(args.db)
+    if args.command == "import":
+        start = time.perf_counter()
+        before = store.count()
+        with store.bulk_load():
+            for filename in args.files:
+                with open(filename, "r", encoding="utf-8") as f:
+                    for line in f:
+                        store.add(json.loads(line))
+        added = store.count() - before
+        print(f"Imported {added:,} events in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    elif args.command == "top-killers":
+        _print_rows(store.top_killers(args.victim, args.since, args.zone, args.limit))
+    else:
+        _print_rows(store.history(args.kind, args.killer, args.victim, args.zone, args.since, args.until, args.limit))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Typed event records produced by the RuleEngine.
+# Each type uses __slots__, so a parsed event is a small fixed-layout object rather than a dict.
+
+
+class Event:
+    __slots__ = ("timestamp", "source")
+    name = "event"
+    fields = ()
+
+    def __init__(self, *values, timestamp=None, source=None):
+        self.timestamp = timestamp
+        self.source = source
+        for field, value in zip(self.fields, values):
+            setattr(self, field, value)
+
+    def to_dict(self):
+        """JSON-serialisable form, used by the JSONL sink and the offline tools."""
+        record = {"event": self.name, "source": self.source, "timestamp": self.timestamp}
+        for field in self.fields:
+            record[field] = getattr(self, field)
+        return record
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{self.__class__.__name__}({values}, timestamp={self.timestamp!r})"
+
+
+class ActorDeath(Event):
+    name = "actor_death"
+    fields = __slots__ = ("actor_name", "actor_id", "zone", "killer_name", "killer_id", "weapon", "weapon_class", "damage_type")
+
+
+class VehicleDestroy(Event):
+    name = "vehicle_destroy"
+    fields = __slots__ = ("vehicle_name", "vehicle_id", "zone", "destroyer_name", "destroyer_id", "destruction_type")
+
+
+class QuantumTravel(Event):
+    name = "qt"
+    fields = __slots__ = ("entity_name",)
+
+
+class ElevatorDoor(Event):
+    name = "elevator_door"
+    fields = __slots__ = ("manager_id", "state")  # state is "opened" or "closed"
+
+
+class ElevatorAlert(Event):
+    name = "elevator_alert"
+    # alert is the shared alert entry from zone_registry.json; phase is "start" or "finish" of a transit
+    fields = __slots__ = ("alert", "manager_id", "phase")
+
+    def to_dict(self):
+        record = {"event": self.name, "source": self.source, "timestamp": self.timestamp}
+        record["token"] = self.alert["token"]
+        record["message"] = self.alert["message"]
+        record["manager_id"] = self.manager_id
+        record["phase"] = self.phase
+        return record
+
+
+EVENT_TYPES = {cls.name: cls for cls in (ActorDeath, VehicleDestroy, QuantumTravel, ElevatorDoor, ElevatorAlert)}
+
+
+def event_type(name, fields):
+    """The record class for a rule; rules for new event names get a slots class generated on the fly."""
+    if name not in EVENT_TYPES:
+        class_name = "".join(part.title() for part in name.split("_"))
+        EVENT_TYPES[name] = type(class_name, (Event,), {"__slots__": tuple(fields), "fields": tuple(fields), "name": name})
+    return EVENT_TYPES[name]
@@ -0,0 +1,133 @@
+import os
+import json
+from app_state import state_path
+from events import EVENT_TYPES
+
+# Which parsed events get reported. The bundled file keeps the stock NPC filtering; a kill_filters.json in the
+# state directory (or the file named by BV_KILL_FILTERS) replaces it, so each user can keep their own filters.
+BUNDLED_FILTERS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kill_filters.json")
+USER_FILTERS = "kill_filters.json"
+
+
+def filters_path():
+    override = os.environ.get("BV_KILL_FILTERS")
+    if override:
+        return override
+    user_path = state_path(USER_FILTERS)
+    return user_path if os.path.exists(user_path) else BUNDLED_FILTERS
+
+
+class KillFilter:
+    """A compiled kill filter: call it with an event to decide whether it's reported.
+
+    The rules for the event's type are tried in order and the first one whose
+    conditions all hold decides; if none does, the type's default applies
+    (report, unless "default" says otherwise). Name and zone lists are frozensets,
+    so a condition costs the same whether it lists one name or thousands.
+    """
+
+    def __init__(self, rules, defaults):
+        self.rules = rules  # event name -> ((checks, report), ...)
+        self.defaults = defaults
+
+    def __call__(self, event):
+        for checks, report in self.rules.get(event.name, ()):
+            for field, test in checks:
+                if not test(getattr(event, field, None)):
+                    break
+            else:
+                return report
+        return self.defaults.get(event.name, True)
+
+
+def _expect(value, kind, where):
+    if not isinstance(value, kind):
+        raise ValueError(f"{where}: expected {'an object' if kind is dict else 'a list' if kind is list else 'true or false'}, "
+                         f"got {json.dumps(value)}")
+    return value
+
+
+def _names(value, lists, where):
+    """A condition value as a set of names; "@list" refers to an entry of "lists"."""
+    values = value if isinstance(value, list) else [value]
+    names = set()
+    for item in values:
+        if not isinstance(item, str):
+            raise ValueError(f"{where}: expected a name or list of names, got {item!r}")
+        if item.startswith("@"):
+            if item[1:] not in lists:
+                raise ValueError(f"{where}: unknown list {item}")
+            names |= lists[item[1:]]
+        else:
+            names.add(item)
+    return frozenset(names)
+
+
+def _compile_test(value, lists, where):
+    if isinstance(value, dict):
+        if set(value) == {"not"}:
+            inner = _compile_test(value["not"], lists, where)
+            return lambda field_value: not inner(field_value)
+        if set(value) == {"prefix"}:
+            prefixes = tuple(_names(value["prefix"], lists, where))
+            return lambda field_value: field_value is not None and field_value.startswith(prefixes)
+        raise ValueError(f"{where}: conditions are a name, a list, {{\"not\": ...}} or {{\"prefix\": ...}}")
+    names = _names(value, lists, where)
+    if len(names) == 1:
+        (name,) = names
+        return lambda field_value: field_value == name
+    return names.__contains__
+
+
+def _record_type(event_name, where):
+    if event_name not in EVENT_TYPES:
+        raise ValueError(f"{where}: unknown event '{event_name}' (expected one of {', '.join(EVENT_TYPES)})")
+    return EVENT_TYPES[event_name]
+
+
+def compile_filters(spec):
+    """Build a KillFilter from the parsed JSON; raises ValueError describing the first problem found.
+
+    {
+      "lists": {"members": ["Alice", "Bob"]},
+      "rules": {
+        "actor_death": [
+          {"when": {"killer_name": "@members"}, "report": true},
+          {"when": {"zone": {"prefix": "OOC_"}}, "report": false}
+        ]
+      },
+      "default": {"actor_death": false}
+    }
+    """
+    _expect(spec, dict, "filter file")
+    lists = {}
+    for name, names in _expect(spec.get("lists", {}), dict, "lists").items():
+        for item in _expect(names, list, f"lists/{name}"):
+            if not isinstance(item, str):
+                raise ValueError(f"lists/{name}: expected names, got {json.dumps(item)}")
+        lists[name] = frozenset(names)
+    rules = {}
+    for event_name, event_rules in _expect(spec.get("rules", {}), dict, "rules").items():
+        record_type = _record_type(event_name, "rules")
+        compiled = []
+        for index, rule in enumerate(_expect(event_rules, list, f"rules/{event_name}")):
+            where = f"{event_name} rule {index + 1}"
+            _expect(rule, dict, where)
+            checks = []
+            for field, value in _expect(rule.get("when", {}), dict, f"{where}/when").items():
+                if field not in record_type.fields:
+                    raise ValueError(f"{where}: {event_name} has no field '{field}'")
+                checks.append((field, _compile_test(value, lists, f"{where}/{field}")))
+            compiled.append((tuple(checks), _expect(rule.get("report", True), bool, f"{where}/report")))
+        rules[event_name] = tuple(compiled)
+    defaults = {}
+    for event_name, report in _expect(spec.get("default", {}), dict, "default").items():
+        _record_type(event_name, "default")
+        defaults[event_name] = _expect(report, bool, f"default/{event_name}")
+    return KillFilter(rules, defaults)
+
+
+def load_filters(path=None):
+    """Read and compile the filter file (see filters_path)."""
+    with open(path or filters_path(), "r", encoding="utf-8") as f:
+        return compile_filters(json.load(f))
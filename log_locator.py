@@ -0,0 +1,139 @@
+import os
+import time
+from app_state import load_state, save_state
+
+LOCATION_FILE = "log_location.json"
+# Release channels installed side by side under the StarCitizen folder
+CHANNELS = ("LIVE", "PTU", "EPTU", "TECH-PREVIEW")
+# A Game.log untouched for longer than this is assumed to be from an old session
+MAX_LOG_AGE = 12 * 60 * 60
+PROCESS_NAMES = ("StarCitizen", "RSI Launcher")
+
+
+# Function to find the Game.log file next to (or one level above) a game executable directory
+def find_game_log(directory):
+    for path in [os.path.join(directory, 'Game.log'), os.path.join(os.path.dirname(directory), 'Game.log')]:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def is_valid_log(path, max_age=MAX_LOG_AGE):
+    """The file exists and was written to recently enough to belong to a running game."""
+    try:
+        return time.time() - os.path.getmtime(path) <= max_age
+    except (OSError, TypeError):
+        return False
+
+
+# Function to list the usual install locations for every channel
+def common_log_paths():
+    roots = []
+    for variable in ("ProgramFiles", "ProgramW6432"):
+        if os.environ.get(variable):
+            roots.append(os.path.join(os.environ[variable], "Roberts Space Industries", "StarCitizen"))
+    for drive in "CDEF":
+        roots.append(os.path.join(f"{drive}:\\", "Roberts Space Industries", "StarCitizen"))
+        roots.append(os.path.join(f"{drive}:\\", "Program Files", "Roberts Space Industries", "StarCitizen"))
+    paths = []
+    for root in dict.fromkeys(roots):
+        paths.extend(os.path.join(root, channel, "Game.log") for channel in CHANNELS)
+    return paths
+
+
+def scan_processes(names=PROCESS_NAMES):
+    """One pass over the process list; returns {name: exe} for each name found."""
+    import psutil  # Only needed on the slow path
+    found = {}
+    wanted = [(name, name.lower()) for name in names]
+    for proc in psutil.process_iter(['name', 'exe']):
+        proc_name = (proc.info['name'] or "").lower()
+        for name, lowered in wanted:
+            if name not in found and lowered in proc_name:
+                found[name] = proc.info['exe']
+        if len(found) == len(wanted):
+            break
+    return found
+
+
+def remember_log_location(path):
+    try:
+        save_state(LOCATION_FILE, {"path": path})
+    except OSError:
+        pass
+
+
+def locate_game_log(max_age=MAX_LOG_AGE):
+    """Return (path, source) for the active Game.log, or (None, reason).
+
+    Cheap checks come first: the SC_LOG_LOCATION override, the last known
+    location and the standard install folders. Only when none of those holds a
+    recently written Game.log is the process list scanned.
+    """
+    remembered = (load_state(LOCATION_FILE) or {}).get("path")
+    quick = [("SC_LOG_LOCATION", os.environ.get("SC_LOG_LOCATION")), ("last known location", remembered)]
+    quick.extend(("install folder", path) for path in common_log_paths())
+
+    for source, path in quick:
+        if path and is_valid_log(path, max_age):
+            if path != remembered:
+                remember_log_location(path)
+            return path, source
+
+    processes = scan_processes()
+    sc_path = processes.get("StarCitizen")
+    if not sc_path:
+        if not processes.get("RSI Launcher"):
+            return None, "RSI Launcher not running."
+        return None, "Star Citizen not running."
+
+    log_path = find_game_log(os.path.dirname(sc_path))
+    if not log_path:
+        return None, "Game.log not found."
+    remember_log_location(log_path)
+    return log_path, "running game"
+
+
+def log_channel(path):
+    """LIVE/PTU/EPTU/... for a Game.log in a standard install, else the name of its folder."""
+    return os.path.basename(os.path.dirname(os.path.abspath(path))).upper() or "LOG"
+
+
+def locate_game_logs(max_age=MAX_LOG_AGE):
+    """Return ([(channel, path, source), ...], None) for every channel with a recent Game.log.
+
+    SC_LOG_LOCATION may list several logs separated by os.pathsep. Besides the
+    usual install folders, the other channels next to any known log are checked,
+    so a custom install path still finds PTU beside LIVE. When nothing turns up
+    this falls back to locate_game_log(), and returns ([], reason) if that fails.
+    """
+    remembered = (load_state(LOCATION_FILE) or {}).get("path")
+    quick = [("SC_LOG_LOCATION", path) for path in os.environ.get("SC_LOG_LOCATION", "").split(os.pathsep) if path]
+    if remembered:
+        quick.append(("last known location", remembered))
+    siblings = []
+    for _, path in quick:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+        siblings.extend(("install folder", os.path.join(root, channel, "Game.log")) for channel in CHANNELS)
+    candidates = quick + siblings + [("install folder", path) for path in common_log_paths()]
+
+    found = {}
+    seen = set()
+    for source, path in candidates:
+        key = os.path.normcase(os.path.abspath(path))
+        if key in seen or not is_valid_log(path, max_age):
+            continue
+        seen.add(key)
+        channel = log_channel(path)
+        if channel in found:
+            if source != "SC_LOG_LOCATION":
+                continue  # Same channel installed on another drive; the first one wins
+            channel = f"{channel}-{len(found) + 1}"  # Explicitly listed logs are all followed
+        found[channel] = (channel, path, source)
+    if found:
+        return list(found.values()), None
+
+    log_path, source = locate_game_log(max_age)
+    if not log_path:
+        return [], source
+    return [(log_channel(log_path), log_path, source)], None
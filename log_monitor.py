@@ -0,0 +1,104 @@
+import time
+import threading
+from log_tail import MIN_WAIT, MAX_WAIT
+
+
+class LogMonitor:
+    """Tails several Game.logs (e.g. LIVE and PTU) on a single thread.
+
+    Each round reads at most one block from every tailer, so a busy log can't
+    starve a quiet one, and hands the complete lines to on_lines(source, lines).
+    Lines from before a resumed checkpoint go to on_catchup instead, if given.
+    The poll interval backs off exactly like a single LogTailer: MIN_WAIT while
+    any log is active, doubling to MAX_WAIT once all of them are idle, which is
+    also when each file is checked for having been rewritten.
+    """
+
+    def __init__(self, on_lines, on_error=None, min_wait=MIN_WAIT, max_wait=MAX_WAIT, on_catchup=None):
+        self.on_lines = on_lines
+        self.on_catchup = on_catchup
+        self.on_error = on_error
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.running = False
+        self.tailers = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def sources(self):
+        with self._lock:
+            return list(self.tailers)
+
+    def add(self, source, tailer):
+        """Start following another log; may be called while the monitor runs."""
+        with self._lock:
+            self.tailers[source] = tailer
+
+    def remove(self, source):
+        """Stop following a log; its file is closed (and checkpointed) by the monitor thread."""
+        with self._lock:
+            tailer = self.tailers.get(source)
+        if tailer:
+            tailer.stop()
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        """Wait for the thread to finish closing (and checkpointing) every log."""
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _drop(self, source, tailer):
+        with self._lock:
+            if self.tailers.get(source) is tailer:
+                del self.tailers[source]
+        tailer.close()
+
+    def _run(self):
+        wait = self.min_wait
+        try:
+            while self.running:
+                with self._lock:
+                    tailers = list(self.tailers.items())
+                busy = False
+                for source, tailer in tailers:
+                    if not tailer.running:
+                        self._drop(source, tailer)
+                        continue
+                    try:
+                        lines = tailer.poll()
+                    except OSError as e:
+                        # One missing or unreadable log shouldn't stop the others
+                        self._drop(source, tailer)
+                        if self.on_error:
+                            self.on_error(source, e)
+                        continue
+                    if lines is None:
+                        continue
+                    busy = True
+                    if lines:
+                        if self.on_catchup and tailer.catching_up:
+                            self.on_catchup(source, lines)
+                        else:
+                            self.on_lines(source, lines)
+                if busy:
+                    wait = self.min_wait
+                    continue
+                if wait == self.max_wait:
+                    for source, tailer in tailers:
+                        tailer.check_replaced()
+                time.sleep(wait)
+                wait = min(wait * 2, self.max_wait)
+        finally:
+            with self._lock:
+                tailers = list(self.tailers.values())
+                self.tailers.clear()
+            for tailer in tailers:
+                tailer.close()
@@ -0,0 +1,135 @@
+import re
+from events import ElevatorAlert, ElevatorDoor, event_type
+from zone_registry import load_registry
+from kill_filters import load_filters
+
+# Game.log lines start with a timestamp such as <2025-02-21T20:01:02.123Z>
+TIMESTAMP_PATTERN = re.compile(r"^<([^>]+)>")
+
+# Event rules for Game.log lines.
+# Each rule has a cheap literal "token" that is checked first; the rule's regex only runs
+# when its token is present in the line. New event types are added here, not in the parser;
+# "fields" name the regex groups and become the slots of the event record (see events.py).
+KILL_RULES = [
+    {
+        "name": "vehicle_destroy",
+        "token": "OnAdvanceDestroyLevel",
+        "pattern": r"Destruction> CVehicle::OnAdvanceDestroyLevel: Vehicle '([^']+)' \[([^\]]+)\] in zone '([^']+)' .*caused by '([^']+)' \[([^\]]+)\] with '([^']+)'",
+        "fields": ("vehicle_name", "vehicle_id", "zone", "destroyer_name", "destroyer_id", "destruction_type"),
+    },
+    {
+        "name": "actor_death",
+        "token": "CActor::Kill",
+        "pattern": r"CActor::Kill: '([^']+)' \[([^\]]+)\] in zone '([^']+)' killed by '([^']+)' \[([^\]]+)\] using '([^']+)' \[([^']+)\] with damage type '([^']+)'",
+        "fields": ("actor_name", "actor_id", "zone", "killer_name", "killer_id", "weapon", "weapon_class", "damage_type"),
+    },
+    {
+        "name": "qt",
+        "token": "Entity Trying To QT",
+        "pattern": r"-- Entity Trying To QT: ([^\s]+)",
+        "fields": ("entity_name",),
+    },
+]
+
+# Only lines containing one of these are considered for contested zone elevator alerts
+ELEVATOR_TOKENS = ("TransitCarriageStartTransit", "TransitCarriageFinishTransit")
+
+# Every carriage line names its TransitManager_* id, which identifies the elevator
+ELEVATOR_MANAGER_PATTERN = r"TransitManager_[^\s\]\)]+"
+
+# Door changes are only reported for contested zone elevators: managers with this prefix,
+# or whose line matches a registry alert token. City and station elevators are ignored.
+CONTESTED_MANAGER_PREFIX = "TransitManager_TransitDungeon"
+
+
+def _alternation(tokens):
+    # Longest tokens first so a token that is a prefix of another never shadows it
+    return re.compile("|".join(re.escape(token) for token in sorted(tokens, key=len, reverse=True)))
+
+
+class RuleEngine:
+    """Precompiled dispatcher for Game.log lines.
+
+    A single alternation regex over every rule token acts as the prefilter, so lines
+    that can't match anything (the vast majority) cost one scan. Only the regex of the
+    rule whose token was found is then run against the line. Elevator alerts come from
+    the zone registry and are likewise compiled into one alternation, so adding zones
+    doesn't add per-line work.
+    """
+
+    def __init__(self, kill_rules=KILL_RULES, elevator_alerts=None):
+        if elevator_alerts is None:
+            elevator_alerts = load_registry()["alerts"]
+        self.rules = {}
+        for rule in kill_rules:
+            self.rules[rule["token"]] = (re.compile(rule["pattern"]), event_type(rule["name"], rule["fields"]))
+        self.elevator_alerts = {alert["token"]: alert for alert in elevator_alerts}
+        self.elevator_order = [alert["token"] for alert in elevator_alerts]
+
+        self.prefilter_tokens = list(self.rules) + list(ELEVATOR_TOKENS)
+        self.prefilter = _alternation(self.prefilter_tokens)
+        self.elevator_prefilter = _alternation(self.elevator_alerts)
+        self.manager_pattern = re.compile(ELEVATOR_MANAGER_PATTERN)
+
+    def parse_line(self, line, source=None):
+        """Return the list of event records (see events.py) for a single log line."""
+        hit = self.prefilter.search(line)
+        if not hit:
+            return []
+
+        token = hit.group()
+        if token in self.rules:
+            pattern, record_type = self.rules[token]
+            match = pattern.search(line)
+            if not match:
+                return []
+            return [record_type(*match.groups(), timestamp=_timestamp(line), source=source)]
+
+        return self._parse_elevator(line, source)
+
+    def rule_name(self, line):
+        """Name of the rule a line is dispatched to ("elevator" for carriage lines), or None."""
+        hit = self.prefilter.search(line)
+        if not hit:
+            return None
+        rule = self.rules.get(hit.group())
+        return rule[1].name if rule else "elevator"
+
+    def _parse_elevator(self, line, source):
+        events = []
+        timestamp = _timestamp(line)
+        match = self.manager_pattern.search(line)
+        manager_id = match.group() if match else None
+        found = set(self.elevator_prefilter.findall(line))
+
+        # Door state changes are reported per contested zone elevator manager
+        contested = found or (manager_id and manager_id.startswith(CONTESTED_MANAGER_PREFIX))
+        if manager_id and contested and ("Opened:" in line or "Closed:" in line):
+            state = "opened" if "Opened:" in line else "closed"
+            events.append(ElevatorDoor(manager_id, state, timestamp=timestamp, source=source))
+
+        if found:
+            phase = "start" if "TransitCarriageStartTransit" in line else "finish"
+            for token in self.elevator_order:
+                if token in found:
+                    # Fall back to the alert token so lines without a manager id still get tracked
+                    alert_manager = manager_id or token
+                    events.append(ElevatorAlert(self.elevator_alerts[token], alert_manager, phase, timestamp=timestamp, source=source))
+        return events
+
+
+def _timestamp(line):
+    match = TIMESTAMP_PATTERN.match(line)
+    return match.group(1) if match else None
+
+
+_report_filter = None
+
+
+# Function to decide whether a parsed kill/vehicle event should be reported
+def should_report(event):
+    """Apply the kill filters from kill_filters.json (see kill_filters.py), compiled on first use."""
+    global _report_filter
+    if _report_filter is None:
+        _report_filter = load_filters()
+    return _report_filter(event)
@@ -0,0 +1,85 @@
+import os
+import mmap
+import heapq
+from collections import deque
+from log_rules import ELEVATOR_TOKENS
+
+
+def prefilter_tokens(engine):
+    """The literal tokens a line must contain for the RuleEngine to produce anything from it.
+
+    Each token costs one pass over the file, so the elevator tokens are folded
+    into their common prefix ("TransitCarriage"); the engine still checks the
+    full token on the few lines that contain it.
+    """
+    tokens = [token for token in engine.prefilter_tokens if token not in ELEVATOR_TOKENS]
+    tokens.append(os.path.commonprefix(ELEVATOR_TOKENS) or ELEVATOR_TOKENS[0])
+    return [token.encode("utf-8") for token in dict.fromkeys(tokens)]
+
+
+def complete_end(path, start=0, end=None):
+    """Offset just past the last complete line in [start, end); start if there is none."""
+    with open(path, "rb") as log_file:
+        size = os.fstat(log_file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if end <= start:
+            return start
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.rfind(b"\n", start, end) + 1 or start
+
+
+def scan_lines(path, tokens, start=0, end=None):
+    """Yield (next_offset, line) for every line in [start, end) that contains one of `tokens`.
+
+    The file is memory-mapped and each token is located with bytes.find, which
+    skips through the raw bytes far faster than splitting and decoding every
+    line; only the lines around hits are decoded. Lines are yielded in file
+    order, once each however many tokens they contain. A partial last line
+    (still being written) is left out; use complete_end() to find where the
+    scan stopped. next_offset is just past the line's newline, where reading
+    would resume after it.
+    """
+    with open(path, "rb") as log_file:
+        size = os.fstat(log_file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if end <= start:
+            return
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Next hit of every token, merged in file order
+            hits = []
+            for token in tokens:
+                position = mapped.find(token, start, end)
+                if position >= 0:
+                    hits.append((position, token))
+            heapq.heapify(hits)
+            while hits:
+                position, token = hits[0]
+                line_start = mapped.rfind(b"\n", start, position) + 1 or start
+                line_end = mapped.find(b"\n", position, end)
+                if line_end < 0:
+                    return  # Incomplete last line
+                yield line_end + 1, mapped[line_start:line_end].rstrip(b"\r").decode("utf-8", errors="replace")
+                # Move every token that hit this line past it
+                while hits and hits[0][0] < line_end:
+                    _, token = heapq.heappop(hits)
+                    position = mapped.find(token, line_end, end)
+                    if position >= 0:
+                        heapq.heappush(hits, (position, token))
+
+
+def scan_events(path, engine, start=0, end=None, source=None):
+    """Yield the events the engine parses from the file, decoding only lines with a prefilter hit."""
+    for _, line in scan_lines(path, prefilter_tokens(engine), start, end):
+        yield from engine.parse_line(line, source)
+
+
+def search_events(paths, engine, query, limit=None):
+    """Events from `paths` whose fields contain `query` (case-insensitive); the most recent `limit`."""
+    query = query.lower()
+    found = deque(maxlen=limit)
+    for path in paths:
+        for event in scan_events(path, engine, source=path):
+            text = " ".join(str(value) for value in event.to_dict().values()).lower()
+            if query in text:
+                found.append(event)
+    return list(found)
@@ -0,0 +1,245 @@
+import os
+import time
+import hashlib
+from itertools import islice
+from app_state import load_state, save_state
+from log_scan import complete_end, scan_lines
+
+# Bytes read per call; a burst of log output is consumed in a handful of reads
+BLOCK_SIZE = 256 * 1024
+# Poll interval right after new data arrived, and the ceiling it backs off to while idle
+MIN_WAIT = 0.002
+MAX_WAIT = 0.05
+# Checkpoints identify the file by a hash of its first bytes (the log header has the session start time)
+FINGERPRINT_BYTES = 1024
+CHECKPOINT_INTERVAL = 2.0
+# A resumed backlog at least this big is caught up with the mmap token scan (see log_scan.py), CATCHUP_BATCH lines at a time
+CATCHUP_BYTES = 4 * 1024 * 1024
+CATCHUP_BATCH = 1000
+
+
+class LogTailer:
+    """Follow a growing log file and yield batches of complete lines.
+
+    The file is read in large binary blocks and split into lines here, with any
+    partial trailing line kept until the rest of it is written. When no data is
+    available the poll interval starts at MIN_WAIT and doubles up to MAX_WAIT, so
+    alerts arrive within milliseconds during activity while an idle game costs
+    only a few cheap reads per second.
+    """
+
+    def __init__(self, path, from_end=True, block_size=BLOCK_SIZE, min_wait=MIN_WAIT, max_wait=MAX_WAIT, on_reopen=None,
+                 checkpoint_file=None, checkpoint_interval=CHECKPOINT_INTERVAL, on_resume=None, catchup_tokens=None):
+        self.path = path
+        self.from_end = from_end
+        self.block_size = block_size
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.on_reopen = on_reopen
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_interval = checkpoint_interval
+        self.on_resume = on_resume
+        self.catchup_tokens = catchup_tokens
+        self.running = True
+        self.reopen_count = 0
+        self._pending = b""
+        self._fingerprint = None
+        self._last_checkpoint = 0.0
+        self._file = None
+        self._from_end = from_end
+        self._catchup = None
+        self._catchup_end = 0
+        self._catchup_position = 0
+        self._backlog_end = 0
+        self.catching_up = False
+
+    def stop(self):
+        self.running = False
+
+    def _split(self, data):
+        data = self._pending + data
+        lines = data.split(b"\n")
+        self._pending = lines.pop()  # Incomplete last line (or b"" after a trailing newline)
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in lines]
+
+    def _was_replaced(self, log_file):
+        """True if the path now points at a new file, or the open file was truncated."""
+        try:
+            on_disk = os.stat(self.path)
+        except OSError:
+            return False  # Mid-rewrite; keep the old handle until the new file appears
+        opened = os.fstat(log_file.fileno())
+        if on_disk.st_ino != opened.st_ino or on_disk.st_dev != opened.st_dev:
+            return True
+        return on_disk.st_size < log_file.tell()
+
+    def _read_fingerprint(self, log_file, size=FINGERPRINT_BYTES):
+        position = log_file.tell()
+        log_file.seek(0)
+        head = log_file.read(size)
+        log_file.seek(position)
+        return len(head), hashlib.sha1(head).hexdigest()
+
+    def _resume_offset(self, log_file):
+        """Offset saved by the last run if it was tailing this same file, else None."""
+        checkpoint = load_state(self.checkpoint_file)
+        if not checkpoint or checkpoint.get("path") != os.path.abspath(self.path):
+            return None
+        head_size, fingerprint = self._read_fingerprint(log_file, checkpoint.get("head_size", 0))
+        if head_size != checkpoint.get("head_size") or fingerprint != checkpoint.get("fingerprint"):
+            return None  # A different session's log
+        offset = checkpoint.get("offset", 0)
+        if offset > os.fstat(log_file.fileno()).st_size:
+            return None
+        return offset
+
+    def _save_checkpoint(self, log_file, force=False):
+        if not self.checkpoint_file:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint < self.checkpoint_interval:
+            return
+        self._last_checkpoint = now
+        # Re-hash until the header is complete, then the fingerprint never changes
+        if self._fingerprint is None or self._fingerprint[0] < FINGERPRINT_BYTES:
+            self._fingerprint = self._read_fingerprint(log_file)
+        head_size, fingerprint = self._fingerprint
+        try:
+            save_state(self.checkpoint_file, {
+                "path": os.path.abspath(self.path),
+                # Start of the first unparsed line
+                "offset": self._catchup_position if self._catchup is not None else log_file.tell() - len(self._pending),
+                "head_size": head_size,
+                "fingerprint": fingerprint,
+            })
+        except OSError:
+            pass  # A missed checkpoint only means replaying a little more next time
+
+    def _open(self, log_file, from_end):
+        if self.checkpoint_file and from_end:
+            offset = self._resume_offset(log_file)
+            if offset is not None:
+                log_file.seek(offset)
+                size = os.fstat(log_file.fileno()).st_size
+                self._backlog_end = size
+                if self.on_resume:
+                    self.on_resume(offset, size)
+                if self.catchup_tokens and size - offset >= CATCHUP_BYTES:
+                    # Only lines containing a rule token can produce events, so skip straight to those
+                    self._catchup_end = complete_end(self.path, offset, size)
+                    self._catchup_position = offset
+                    self._catchup = scan_lines(self.path, self.catchup_tokens, offset, self._catchup_end)
+                return
+        if from_end:
+            log_file.seek(0, os.SEEK_END)
+
+    def poll(self):
+        """Read one block without waiting.
+
+        Returns the complete lines it finished (possibly an empty list when only a
+        partial line arrived), or None when there was no new data. The file is
+        opened on the first call; by the next call the previous batch has been
+        parsed, so that is when the checkpoint is written. catching_up tells
+        whether the returned lines were written before this run resumed.
+        """
+        if self._file is None:
+            self._file = open(self.path, "rb")
+            self._open(self._file, self._from_end)
+        else:
+            self._save_checkpoint(self._file)
+        if self._catchup is not None:
+            batch = list(islice(self._catchup, CATCHUP_BATCH))
+            if batch:
+                self._catchup_position = batch[-1][0]
+                self.catching_up = True
+                return [line for _, line in batch]
+            self._catchup = None
+            self._file.seek(self._catchup_end)  # Carry on tailing normally after the scanned backlog
+        # Reads stop at the end of the resumed backlog, so no batch mixes old and new lines
+        backlog = self._backlog_end - self._file.tell()
+        self.catching_up = backlog > 0
+        data = self._file.read(min(self.block_size, backlog) if self.catching_up else self.block_size)
+        if not data:
+            return None
+        return self._split(data)
+
+    def check_replaced(self):
+        """Reopen from the start if Game.log was rewritten; True when that happened.
+
+        Only worth calling while idle: a rewrite shows up as a new inode or a
+        file shorter than our read position.
+        """
+        if self._file is None or not self._was_replaced(self._file):
+            return False
+        self.close()
+        self._from_end = False
+        self._pending = b""
+        self._fingerprint = None
+        self._backlog_end = 0
+        self.reopen_count += 1
+        if self.on_reopen:
+            self.on_reopen(self.reopen_count)
+        return True
+
+    def close(self):
+        if self._file is not None:
+            self._save_checkpoint(self._file, force=True)
+            self._file.close()
+            self._file = None
+        if self._catchup is not None:
+            self._catchup.close()
+            self._catchup = None
+
+    def batches(self):
+        """Yield lists of new lines until stop() is called.
+
+        When the game restarts it rewrites Game.log; that shows up as a new inode
+        or a file shorter than our read position, and the file is reopened from
+        the start.
+
+        With a checkpoint_file the offset of the last parsed line is saved every
+        checkpoint_interval seconds. A later run on the same file (matched by a
+        hash of its header) resumes from there instead of the end, so lines
+        written while the tool was stopped are still parsed. Given catchup_tokens,
+        a large backlog is first caught up with the mmap scan in log_scan.py,
+        which only returns the lines containing one of those tokens.
+        """
+        wait = self.min_wait
+        try:
+            while self.running:
+                lines = self.poll()
+                if lines is not None:
+                    wait = self.min_wait
+                    if lines:
+                        yield lines
+                    continue
+                if wait == self.max_wait and self.check_replaced():
+                    continue
+                time.sleep(wait)
+                wait = min(wait * 2, self.max_wait)
+        finally:
+            self.close()
+
+
+# Function to stream the complete lines of a file region in blocks (used for offline replay)
+def iter_file_lines(path, start=0, end=None, block_size=BLOCK_SIZE):
+    """Yield decoded lines from byte offset `start` up to `end` (default: end of file).
+
+    Memory use is bounded by block_size no matter how large the file is.
+    """
+    with open(path, "rb") as log_file:
+        log_file.seek(start)
+        position = start
+        pending = b""
+        while end is None or position < end:
+            size = block_size if end is None else min(block_size, end - position)
+            data = log_file.read(size)
+            if not data:
+                break
+            position += len(data)
+            lines = (pending + data).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if pending:
+            yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import functools
+
+# Timings go into power-of-two microsecond buckets: <1us, <2us, <4us, ... (the last one catches everything slower)
+BUCKETS = 32
+
+
+class Histogram:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * BUCKETS
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """Upper edge of the bucket holding that share of the samples, so at most 2x too high."""
+        target = fraction * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if hits and seen >= target:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """Counters, gauges and timing histograms for the hot paths.
+
+    Updates are plain dict and attribute writes without a lock; under the GIL
+    they can't corrupt anything, and an increment lost between two threads now
+    and then doesn't matter for finding a bottleneck. With enabled=False the
+    callers skip timing altogether (see parse_lines in blightveil_gui.py).
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started = time.monotonic()
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {}
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def observe(self, name, seconds):
+        histogram = self.timings.get(name)
+        if histogram is None:
+            histogram = self.timings[name] = Histogram()
+        histogram.observe(seconds)
+
+    def timed(self, name, func):
+        """Wrap func so each call is recorded under `name` while metrics are enabled."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start)
+        return wrapper
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.counters.clear()
+        self.gauges.clear()
+        self.timings.clear()
+
+    def snapshot(self):
+        return {
+            "uptime": time.monotonic() - self.started,
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "timings": {name: histogram.to_dict() for name, histogram in list(self.timings.items())},
+        }
+
+    def report(self):
+        """Plain-text table for the performance overlay."""
+        snapshot = self.snapshot()
+        uptime = max(snapshot["uptime"], 1e-9)
+        lines = [f"{'timing':<24}{'count':>9}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}"]
+        for name, timing in sorted(snapshot["timings"].items()):
+            lines.append(f"{name:<24}{timing['count']:>9,}" + "".join(
+                f"{timing[key] * 1e6:>8,.0f}us" for key in ("mean", "p50", "p99", "max")))
+        lines.append("")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<24}{value:>12,}  ({value / uptime:,.1f}/s)")
+        for name, value in sorted(snapshot["gauges"].items()):
+            lines.append(f"{name:<24}{value:>12,}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as dump_file:
+            json.dump(self.snapshot(), dump_file, indent=2)
+        return path
+
+
+# Shared by the GUI and its worker threads; BV_METRICS=0 turns the per-line timings off
+metrics = Metrics(enabled=os.environ.get("BV_METRICS", "1") != "0")
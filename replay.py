@@ -0,0 +1,78 @@
+"""Replay Game.log files offline and write the parsed events as JSON lines.
+
+Runs the same rules as the GUI without creating any windows, audio or tray icon:
+
+    python replay.py Game.log "C:/.../StarCitizen/LIVE/logbackups" -o events.jsonl
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from log_rules import RuleEngine, should_report
+from log_tail import iter_file_lines
+
+
+# Function to expand files, directories (all *.log inside) and glob patterns into a sorted file list
+def iter_log_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "*.log")))
+        elif os.path.exists(path):
+            yield path
+        else:
+            yield from sorted(glob.glob(path))
+
+
+def iter_events(path, engine, include_all=False, stats=None):
+    """Yield event records for one log file."""
+    for line in iter_file_lines(path):
+        if stats is not None:
+            stats["lines"] += 1
+        for event in engine.parse_line(line, path):
+            if include_all or should_report(event):
+                yield event.to_dict()
+
+
+def replay(paths, output, include_all=False, engine=None):
+    engine = engine or RuleEngine()
+    stats = {"files": 0, "lines": 0, "events": 0, "bytes": 0}
+    start = time.perf_counter()
+    for path in iter_log_files(paths):
+        stats["files"] += 1
+        stats["bytes"] += os.path.getsize(path)
+        for record in iter_events(path, engine, include_all, stats):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stats["events"] += 1
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+# Function to print a one-line throughput summary to stderr
+def report_throughput(stats):
+    seconds = max(stats["seconds"], 1e-9)
+    print(
+        f"{stats['files']} file(s), {stats['lines']:,} lines, {stats['events']:,} events in {seconds:.2f}s "
+        f"({stats['lines'] / seconds:,.0f} lines/s, {stats['bytes'] / seconds / 1e6:.1f} MB/s)",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay Game.log files and emit parsed events as JSON lines.")
+    parser.add_argument("paths", nargs="+", help="Game.log files, logbackups directories or glob patterns")
+    parser.add_argument("-o", "--output", help="Write events to this file instead of stdout")
+    parser.add_argument("--all", action="store_true", help="Emit every matched event, not just the ones the GUI reports")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            stats = replay(args.paths, output, args.all)
+    else:
+        stats = replay(args.paths, sys.stdout, args.all)
+    report_throughput(stats)
+
+
+if __name__ == "__main__":
+    main()
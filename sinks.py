@@ -0,0 +1,98 @@
+import json
+import logging
+import queue
+import threading
+
+SINK_QUEUE_SIZE = 2000
+
+log = logging.getLogger(__name__)
+
+
+class Sink:
+    """Consumes event records on its own thread, through a bounded queue.
+
+    submit() never blocks: when the consumer falls behind, new events for this
+    sink are dropped and counted, so a slow sink can't hold up the parser or
+    the other sinks. `accepts` limits the sink to a set of event names, and a
+    `live_only` sink skips events caught up from an earlier part of the log.
+    """
+
+    def __init__(self, name, handler, accepts=None, enabled=True, queue_size=SINK_QUEUE_SIZE, on_idle=None, live_only=False):
+        self.name = name
+        self.handler = handler
+        self.live_only = live_only
+        self.on_idle = on_idle  # Called once the queue drains, e.g. to flush a file or commit a batch
+        self.accepts = frozenset(accepts) if accepts else None
+        self.enabled = enabled
+        self.dropped = 0
+        self.events = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._run, name=f"sink-{name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, event):
+        if not self.enabled or (self.accepts is not None and event.name not in self.accepts):
+            return
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                break
+            try:
+                self.handler(event)
+                if self.on_idle and self.events.empty():
+                    self.on_idle()
+            except Exception:
+                log.exception("Sink '%s' failed on %s", self.name, event.name)
+            finally:
+                self.events.task_done()
+        self.on_close()
+
+    def on_close(self):
+        pass
+
+    def close(self):
+        self.events.put(None)
+
+
+class JsonlSink(Sink):
+    """Appends every event as one JSON line to a file."""
+
+    def __init__(self, path, name="jsonl", **kwargs):
+        self.file = open(path, "a", encoding="utf-8")
+        # Flush once per burst rather than once per event
+        super().__init__(name, self._write, on_idle=self.file.flush, **kwargs)
+
+    def _write(self, event):
+        self.file.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+
+    def on_close(self):
+        self.file.close()
+
+
+class SinkPipeline:
+    """Fans parsed events out to every registered sink."""
+
+    def __init__(self):
+        self.sinks = {}
+
+    def add(self, sink):
+        self.sinks[sink.name] = sink
+        return sink
+
+    def set_enabled(self, name, enabled):
+        if name in self.sinks:
+            self.sinks[name].enabled = enabled
+
+    def publish(self, event, catchup=False):
+        for sink in self.sinks.values():
+            if not (catchup and sink.live_only):
+                sink.submit(event)
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
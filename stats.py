@@ -0,0 +1,94 @@
+import time
+import heapq
+import threading
+from collections import Counter
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over the last `window` seconds.
+
+    Time is split into `buckets` slots kept in a ring. Each slot holds the counts
+    that arrived during it, and running totals are kept alongside. When a slot
+    expires, only its own counts are subtracted, so recording an event costs O(1)
+    and no history is rescanned.
+    """
+
+    def __init__(self, window=600, buckets=60, clock=time.monotonic):
+        self.window = window
+        self.bucket_width = window / buckets
+        self.ring = [Counter() for _ in range(buckets)]
+        self.totals = Counter()
+        self.clock = clock
+        self.current = int(clock() / self.bucket_width)
+
+    def _advance(self):
+        now = int(self.clock() / self.bucket_width)
+        steps = min(now - self.current, len(self.ring))
+        for offset in range(1, steps + 1):
+            expired = self.ring[(self.current + offset) % len(self.ring)]
+            for key, count in expired.items():
+                remaining = self.totals[key] - count
+                if remaining > 0:
+                    self.totals[key] = remaining
+                else:
+                    del self.totals[key]
+            expired.clear()
+        self.current = max(self.current, now)
+
+    def add(self, key=None, count=1):
+        self._advance()
+        self.ring[self.current % len(self.ring)][key] += count
+        self.totals[key] += count
+
+    def total(self, key=None):
+        self._advance()
+        return self.totals[key] if key is not None else sum(self.totals.values())
+
+    def top(self, n=3):
+        self._advance()
+        return heapq.nlargest(n, self.totals.items(), key=lambda item: item[1])
+
+
+class LiveStats:
+    """Aggregates maintained as events arrive, read by the stats panel."""
+
+    def __init__(self, window=600):
+        self.window = window
+        self.lock = threading.Lock()
+        self.kills_by_killer = SlidingWindowCounter(window)
+        self.deaths_by_zone = SlidingWindowCounter(window)
+        self.elevators = SlidingWindowCounter(window)
+        self.qt_last_minute = SlidingWindowCounter(60, buckets=12)
+
+    def add_event(self, event):
+        # Elevator alerts arrive already de-duplicated, one per trip (see elevators.py)
+        with self.lock:
+            if event.name == "actor_death":
+                self.kills_by_killer.add(event.killer_name)
+                self.deaths_by_zone.add(event.zone)
+            elif event.name == "vehicle_destroy":
+                self.deaths_by_zone.add(event.zone)
+            elif event.name == "elevator_alert":
+                self.elevators.add(event.manager_id)
+            elif event.name == "qt":
+                self.qt_last_minute.add("qt")
+
+    def summary(self, zone_names=None, n=3):
+        """A few lines of text for the panel."""
+        zone_names = zone_names or {}
+        with self.lock:
+            killers = self.kills_by_killer.top(n)
+            zones = self.deaths_by_zone.top(n)
+            elevators = self.elevators.top(n)
+            qt_rate = self.qt_last_minute.total()
+        minutes = self.window // 60
+
+        def join(items, names=None):
+            return ", ".join(f"{(names or {}).get(key, key)} ({count})" for key, count in items) or "-"
+
+        return "\n".join([
+            f"Top killers ({minutes}m): {join(killers)}",
+            f"Deaths by zone ({minutes}m): {join(zones, zone_names)}",
+            f"Elevators ({minutes}m): {join(elevators)}",
+            f"QT attempts/min: {qt_rate}",
+        ])
@@ -0,0 +1,93 @@
+import os
+import json
+import threading
+
+# Maps, icons and elevator alerts; edit this file to add a contested zone, no code changes needed
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zone_registry.json")
+RELOAD_INTERVAL = 2.0
+
+
+def _expect(value, kind, where):
+    if not isinstance(value, kind):
+        raise ValueError(f"{where}: expected {'an object' if kind is dict else 'a list'}, got {json.dumps(value)}")
+    return value
+
+
+def load_registry(path=REGISTRY_PATH):
+    """Read and check zone_registry.json; raises ValueError describing the first problem found."""
+    with open(path, "r", encoding="utf-8") as f:
+        registry = _expect(json.load(f), dict, "registry")
+
+    maps = registry["maps"] = _expect(registry.get("maps", {}), dict, "maps")
+    for map_name, map_info in maps.items():
+        _expect(map_info, dict, map_name)
+        for key in ("title", "image"):
+            if not isinstance(map_info.get(key), str):
+                raise ValueError(f"map {map_name} needs a '{key}' string")
+        icons = _expect(map_info.get("icons", {}), dict, f"{map_name}/icons")
+        for icon_name, position in icons.items():
+            if (not isinstance(position, list) or len(position) != 3 or not isinstance(position[2], str)
+                    or not all(isinstance(n, (int, float)) and not isinstance(n, bool) for n in position[:2])):
+                raise ValueError(f"{map_name}/{icon_name}: icons are [x, y, colour], got {json.dumps(position)}")
+        map_info["icons"] = {icon_name: tuple(position) for icon_name, position in icons.items()}
+
+    alerts = registry["alerts"] = _expect(registry.get("alerts", []), list, "alerts")
+    for alert in alerts:
+        _expect(alert, dict, "alert")
+        for key in ("token", "message", "color", "sound"):
+            if not isinstance(alert.get(key), str):
+                raise ValueError(f"alert {alert.get('token', '?')} needs a '{key}' string")
+        icons = []
+        for icon in _expect(alert.get("icons", []), list, f"alert {alert['token']}/icons"):
+            if not isinstance(icon, list) or len(icon) != 2 or not all(isinstance(name, str) for name in icon):
+                raise ValueError(f"alert {alert['token']}: icons are [map, icon], got {json.dumps(icon)}")
+            map_name, icon_name = icon
+            if icon_name not in maps.get(map_name, {}).get("icons", {}):
+                raise ValueError(f"alert {alert['token']} flashes unknown icon {map_name}/{icon_name}")
+            icons.append((map_name, icon_name))
+        alert["icons"] = icons
+    return registry
+
+
+class RegistryWatcher:
+    """Polls the registry file and calls on_reload(registry) whenever it changes.
+
+    A file that fails to load is reported through on_error and the previous
+    registry stays in use. Other config files are watched the same way by
+    passing their own path and loader (e.g. kill_filters.load_filters).
+    """
+
+    def __init__(self, on_reload, on_error=None, path=REGISTRY_PATH, interval=RELOAD_INTERVAL, loader=load_registry):
+        self.on_reload = on_reload
+        self.loader = loader
+        self.on_error = on_error
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.mtime = self._mtime()
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            mtime = self._mtime()
+            if mtime is None or mtime == self.mtime:
+                continue
+            self.mtime = mtime
+            try:
+                registry = self.loader(self.path)
+            except (OSError, ValueError) as e:
+                if self.on_error:
+                    self.on_error(e)
+                continue
+            self.on_reload(registry)
@@ -0,0 +1,95 @@
+import os
+import ast
+import json
+import threading
+from app_state import load_state, save_state
+
+ZONE_MAPPINGS_URL = "https://raw.githubusercontent.com/BossGamer09/BVLogParcer/refs/heads/main/zone_mappings.json"
+# zone_mappings.json shipped next to the code (inside the bundle when frozen)
+BUNDLED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zone_mappings.json")
+CACHE_FILE = "zone_mappings_cache.json"
+REQUEST_TIMEOUT = 5
+
+
+def parse_mappings(text):
+    try:
+        mappings = json.loads(text)
+    except ValueError:
+        mappings = ast.literal_eval(text)  # Older mapping files were Python dict literals
+    if not isinstance(mappings, dict):
+        raise ValueError("zone mappings must be a JSON object")
+    return mappings
+
+
+class ZoneMappingStore:
+    """Zone code -> readable name, available instantly and refreshed in the background.
+
+    load() uses the on-disk cache from the last successful refresh, falling back
+    to the bundled zone_mappings.json. refresh() makes a conditional request
+    (ETag / If-Modified-Since) with a timeout and only rewrites the cache when
+    the remote file actually changed.
+    """
+
+    def __init__(self, url=ZONE_MAPPINGS_URL, bundled_path=BUNDLED_PATH, cache_file=CACHE_FILE, timeout=REQUEST_TIMEOUT):
+        self.url = url
+        self.bundled_path = bundled_path
+        self.cache_file = cache_file
+        self.timeout = timeout
+        self.mappings = {}
+        self.etag = None
+        self.last_modified = None
+
+    def get(self, zone, default=None):
+        return self.mappings.get(zone, default)
+
+    def load(self):
+        cache = load_state(self.cache_file)
+        if cache and isinstance(cache.get("mappings"), dict):
+            self.mappings = cache["mappings"]
+            self.etag = cache.get("etag")
+            self.last_modified = cache.get("last_modified")
+            return "cache"
+        try:
+            with open(self.bundled_path, "r", encoding="utf-8") as f:
+                self.mappings = parse_mappings(f.read())
+            return "bundled"
+        except (OSError, ValueError, SyntaxError):
+            return None
+
+    def refresh(self):
+        """Fetch the remote mappings if they changed. Returns a short status message."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        import requests  # Loaded on the refresh thread, not at startup
+        try:
+            response = requests.get(self.url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            return f"Zone mappings not refreshed ({e.__class__.__name__}); using {len(self.mappings)} local mappings."
+
+        if response.status_code == 304:
+            return "Zone mappings are up to date."
+        if response.status_code != 200:
+            return f"Error fetching zone mappings. Status Code: {response.status_code}"
+        try:
+            mappings = parse_mappings(response.text)
+        except (ValueError, SyntaxError) as e:
+            return f"Error loading zone mappings: {e}"
+
+        self.mappings = mappings  # Swapped in one assignment; readers never see a partial dict
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        try:
+            save_state(self.cache_file, {"etag": self.etag, "last_modified": self.last_modified, "mappings": mappings})
+        except OSError as e:
+            return f"Zone mappings updated ({len(mappings)}), but the cache could not be saved: {e}"
+        return f"Zone mappings updated ({len(mappings)} zones)."
+
+    def refresh_in_background(self, on_done=None):
+        def run():
+            message = self.refresh()
+            if on_done:
+                on_done(message)
+        threading.Thread(target=run, daemon=True).start()